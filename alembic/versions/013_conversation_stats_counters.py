@@ -0,0 +1,38 @@
+"""Maintain conversation_stats counters with triggers
+
+Revision ID: 013
+Revises: 011
+Create Date: 2025-01-20
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Read and execute SQL file
+    import os
+    sql_file = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        "migrations",
+        "013_conversation_stats_counters.sql"
+    )
+    
+    if os.path.exists(sql_file):
+        with open(sql_file, 'r') as f:
+            op.execute(f.read())
+
+
+def downgrade() -> None:
+    # Drop counter triggers and their functions
+    op.execute("DROP TRIGGER IF EXISTS messages_conversation_stats_trg ON messages")
+    op.execute("DROP TRIGGER IF EXISTS tool_call_logs_conversation_stats_trg ON tool_call_logs")
+    op.execute("DROP FUNCTION IF EXISTS conversation_stats_increment_messages()")
+    op.execute("DROP FUNCTION IF EXISTS conversation_stats_increment_tool_calls()")
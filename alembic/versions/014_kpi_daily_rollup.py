@@ -0,0 +1,35 @@
+"""Add kpi_daily_rollup materialized view
+
+Revision ID: 014
+Revises: 013
+Create Date: 2025-01-21
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Read and execute SQL file
+    import os
+    sql_file = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        "migrations",
+        "014_kpi_daily_rollup.sql"
+    )
+    
+    if os.path.exists(sql_file):
+        with open(sql_file, 'r') as f:
+            op.execute(f.read())
+
+
+def downgrade() -> None:
+    # Drop the rollup (its index goes with it)
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS kpi_daily_rollup")
@@ -0,0 +1,36 @@
+"""Add snapshot_version and computed_at to tenant_kpi_snapshots
+
+Revision ID: 015
+Revises: 014
+Create Date: 2025-01-21
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Read and execute SQL file
+    import os
+    sql_file = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        "migrations",
+        "015_kpi_snapshot_versioning.sql"
+    )
+    
+    if os.path.exists(sql_file):
+        with open(sql_file, 'r') as f:
+            op.execute(f.read())
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS tenant_kpi_snapshots_period_idx")
+    op.execute("ALTER TABLE tenant_kpi_snapshots DROP COLUMN IF EXISTS computed_at")
+    op.execute("ALTER TABLE tenant_kpi_snapshots DROP COLUMN IF EXISTS snapshot_version")
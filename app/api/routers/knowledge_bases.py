@@ -1,5 +1,6 @@
 """Knowledge Bases API router."""
 
+import asyncio
 import json
 import uuid
 from typing import Optional
@@ -20,6 +21,7 @@ from app.api.models import (
     SyncStatusResponse,
 )
 from app.services.kb_sync_service import kb_sync_service
+from app.services.tenant_context_service import invalidate_tenant_context
 from app.services.tool_mapping_service import get_provider_tools_for_abstract
 from app.services.vector_store_service import vector_store_service
 from app.services.file_search_store_service import file_search_store_service
@@ -187,9 +189,19 @@ async def create_knowledge_base(
             "provider": default_provider,
         }
     )
+    if "internal_rag" in enabled_providers:
+        # Internal RAG has no remote store, so its sync record is written with the KB
+        db.execute(
+            text("""
+                INSERT INTO kb_provider_sync (kb_id, provider, is_active, sync_status)
+                VALUES (:kb_id, 'internal_rag', TRUE, 'enabled')
+            """),
+            {"kb_id": kb_id}
+        )
     db.commit()
+    invalidate_tenant_context(tenant_id)
     
-    # Create provider stores and sync records
+    # Create provider stores and sync records for remote providers
     try:
         store_ids = await kb_sync_service.ensure_provider_stores(
             tenant_id=tenant_id,
@@ -391,6 +403,7 @@ async def update_knowledge_base(
         params
     )
     db.commit()
+    invalidate_tenant_context(tenant_id)
     
     # Fetch updated KB
     row = db.execute(
@@ -448,6 +461,7 @@ async def delete_knowledge_base(
         {"kb_id": kb_id, "tenant_id": tenant_id}
     )
     db.commit()
+    invalidate_tenant_context(tenant_id)
     
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Knowledge base not found")
@@ -631,11 +645,12 @@ async def disable_provider(
     
     # If delete_data is true, delete from provider
     if delete_data and sync_record.store_id:
+        # The provider SDK calls are blocking; keep them off the event loop
         try:
             if provider == "openai_file":
-                vector_store_service.delete_vector_store(sync_record.store_id)
+                await asyncio.to_thread(vector_store_service.delete_vector_store, sync_record.store_id)
             elif provider == "gemini_file":
-                file_search_store_service.delete_file_search_store(sync_record.store_id)
+                await asyncio.to_thread(file_search_store_service.delete_file_search_store, sync_record.store_id)
         except Exception as e:
             logger.error(f"Error deleting provider store: {e}", exc_info=True)
             # Continue with disable even if delete fails
@@ -664,6 +679,7 @@ async def disable_provider(
         )
     
     db.commit()
+    kb_sync_service.invalidate_providers_cache(tenant_id, kb_id)
     
     return {
         "status": "disabled" if not delete_data else "deleted",
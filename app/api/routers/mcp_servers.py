@@ -11,6 +11,7 @@ from sqlalchemy import text
 from app.infra.database import get_db
 from app.infra.auth import verify_api_key, require_tenant_access
 from app.infra.validation import validate_tenant_id
+from app.services.tenant_context_service import invalidate_tenant_context
 from app.api.models import (
     CreateMCPServerRequest,
     UpdateMCPServerRequest,
@@ -130,6 +131,7 @@ async def create_mcp_server(
         }
     )
     db.commit()
+    invalidate_tenant_context(tenant_id)
     
     # Audit logging: Log MCP server creation
     try:
@@ -379,6 +381,7 @@ async def update_mcp_server(
         params
     )
     db.commit()
+    invalidate_tenant_context(tenant_id)
     
     # Audit logging: Log MCP server update
     try:
@@ -463,6 +466,7 @@ async def delete_mcp_server(
         {"server_id": server_id, "tenant_id": tenant_id}
     )
     db.commit()
+    invalidate_tenant_context(tenant_id)
     
     # Audit logging: Log MCP server deletion
     try:
@@ -7,7 +7,7 @@ from pydantic import BaseModel, Field
 from app.infra.database import get_db
 from app.infra.auth import verify_api_key
 from app.services.agentic_planner import refine_plan
-from app.services.tenant_context_service import get_tenant_context
+from app.services.tenant_context_service import get_tenant_context_async
 from app.infra.database import get_db_session
 from sqlalchemy import text
 
@@ -47,7 +47,7 @@ async def get_plan_details(
     
     Returns the plan structure, steps, and current status.
     """
-    tenant_ctx = get_tenant_context(api_tenant_id)
+    tenant_ctx = await get_tenant_context_async(api_tenant_id)
     
     with get_db_session(api_tenant_id) as session:
         row = session.execute(
@@ -90,7 +90,7 @@ async def refine_plan_endpoint(
     Updates the plan based on what has been executed so far,
     allowing for dynamic plan adjustment.
     """
-    tenant_ctx = get_tenant_context(api_tenant_id)
+    tenant_ctx = await get_tenant_context_async(api_tenant_id)
     
     try:
         refined_plan = await refine_plan(
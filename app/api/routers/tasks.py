@@ -14,7 +14,7 @@ from app.services.agentic_task_manager import (
     list_tasks,
 )
 from app.infra.metrics import tasks_created_total, tasks_resumed_total
-from app.services.tenant_context_service import get_tenant_context
+from app.services.tenant_context_service import get_tenant_context_async
 from app.models.tenant import TenantContext
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
@@ -53,7 +53,7 @@ async def create_new_task(
     Tasks are used for long-running operations that may need to be resumed
     after interruptions.
     """
-    tenant_ctx = get_tenant_context(api_tenant_id)
+    tenant_ctx = await get_tenant_context_async(api_tenant_id)
     
     try:
         task = await create_task(
@@ -82,7 +82,7 @@ async def get_task_status(
     
     Returns the current state of a task including its progress and intermediate data.
     """
-    tenant_ctx = get_tenant_context(api_tenant_id)
+    tenant_ctx = await get_tenant_context_async(api_tenant_id)
     
     task = await get_task(tenant_ctx, task_id)
     if not task:
@@ -105,7 +105,7 @@ async def resume_interrupted_task(
     
     Resumes a task that was paused or failed, continuing from the last successful step.
     """
-    tenant_ctx = get_tenant_context(api_tenant_id)
+    tenant_ctx = await get_tenant_context_async(api_tenant_id)
     
     try:
         task = await resume_task(tenant_ctx, task_id)
@@ -134,7 +134,7 @@ async def cancel_running_task(
     
     Marks a task as failed and stops further execution.
     """
-    tenant_ctx = get_tenant_context(api_tenant_id)
+    tenant_ctx = await get_tenant_context_async(api_tenant_id)
     
     try:
         await cancel_task(tenant_ctx, task_id)
@@ -163,7 +163,7 @@ async def list_tenant_tasks(
     
     Returns a paginated list of tasks, optionally filtered by status.
     """
-    tenant_ctx = get_tenant_context(api_tenant_id)
+    tenant_ctx = await get_tenant_context_async(api_tenant_id)
     
     try:
         tasks = await list_tasks(tenant_ctx, status=status, limit=limit, offset=offset)
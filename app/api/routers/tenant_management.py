@@ -18,6 +18,8 @@ from app.services.tool_mapping_service import (
     get_provider_from_tool_name,
 )
 from app.services.kb_sync_service import kb_sync_service
+from app.services.tenant_context_service import invalidate_tenant_context
+from app.services.tool_registry import invalidate_allowed_tools
 import logging
 
 logger = logging.getLogger(__name__)
@@ -89,6 +91,7 @@ async def update_tenant_prompt(
             request.custom_system_prompt,
             request.override_mode
         )
+        invalidate_tenant_context(tenant_id)
         return PromptUpdateResponse(**result)
     except ValueError as e:
         # Validation failed
@@ -182,6 +185,7 @@ async def delete_tenant_prompt(
         {"tenant_id": tenant_id}
     )
     db.commit()
+    invalidate_tenant_context(tenant_id)
     
     return {
         "status": "deleted",
@@ -419,6 +423,8 @@ async def enable_tool_for_tenant(
         created_at = datetime.now()
     
     db.commit()
+    invalidate_tenant_context(tenant_id)
+    invalidate_allowed_tools(tenant_id)
     
     # Fetch updated policy
     row = db.execute(
@@ -545,6 +551,8 @@ async def update_tool_policy(
     query = f"UPDATE tenant_tool_policies SET {', '.join(set_clauses)} WHERE id = :id"
     db.execute(text(query), params)
     db.commit()
+    invalidate_tenant_context(tenant_id)
+    invalidate_allowed_tools(tenant_id)
     
     # Fetch updated policy
     row = db.execute(
@@ -631,6 +639,8 @@ async def disable_tool_for_tenant(
         {"tenant_id": tenant_id, "tool_id": tool.id}
     )
     db.commit()
+    invalidate_tenant_context(tenant_id)
+    invalidate_allowed_tools(tenant_id)
     
     # If abstract tool (file_search), auto-disable provider tools
     if is_abstract_tool(tool_name):
@@ -688,11 +698,14 @@ async def disable_tool_for_tenant(
                                 "provider": provider,
                             }
                         )
+                        kb_sync_service.invalidate_providers_cache(tenant_id, kb.id)
                 
             except Exception as e:
                 logger.error(f"Error disabling provider tool {provider_tool_name}: {e}", exc_info=True)
         
         db.commit()
+        invalidate_tenant_context(tenant_id)
+        invalidate_allowed_tools(tenant_id)
     
     if result.rowcount == 0:
         # Idempotent - return success even if not found
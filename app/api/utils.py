@@ -12,9 +12,9 @@ from sqlalchemy import text
 from fastapi import HTTPException, status
 
 from app.models.message import CanonicalMessage, MessageParty, MessageContent
-from app.services.tenant_context_service import get_tenant_context
+from app.services.tenant_context_service import get_tenant_context_async
 from app.services.prompt_builder import build_messages
-from app.services.tool_registry import get_allowed_tools
+from app.services.tool_registry import get_allowed_tools_async
 from app.services.tool_execution_engine import execute_tool_call
 from app.services.agentic_planner import create_plan, refine_plan
 from app.services.agentic_reflector import reflect_on_execution
@@ -23,7 +23,6 @@ from app.adapters.vendor_adapter_openai import call_openai_responses, build_open
 from app.adapters.vendor_adapter_gemini import call_gemini
 from app.logging.event_logger import log_event, log_tool_call
 from app.infra.database import get_db_session
-from app.services.conversation_stats import update_conversation_stats
 from app.infra.rate_limiter import check_rate_limit, get_rate_limit_headers
 from app.services.cost_calculator import calculate_llm_cost, calculate_tool_cost
 from app.infra.error_handler import retry_with_backoff, classify_error, RateLimitError, AuthError
@@ -231,7 +230,7 @@ async def handle_inbound_message_sync(
             )
         
         # Load tenant context
-        tenant_ctx = get_tenant_context(tenant_id)
+        tenant_ctx = await get_tenant_context_async(tenant_id)
         
         # Get or create conversation FIRST (before logging events)
         # Resolve channel_id from message metadata or channel lookup
@@ -291,7 +290,7 @@ async def handle_inbound_message_sync(
         history = get_conversation_history(db, tenant_id, conversation_id)
         
         # Get allowed tools
-        tools = get_allowed_tools(tenant_ctx)
+        tools = await get_allowed_tools_async(tenant_ctx)
         
         # Generate plan if planning is enabled
         plan = None
@@ -376,8 +375,9 @@ async def handle_inbound_message_sync(
             plan_context += "\nFollow this plan when executing tools. Update plan status as you progress."
             
             # Add to first system message or create new one
+            # (replace rather than mutate: the leading system messages are shared)
             if llm_messages and llm_messages[0].get("role") == "system":
-                llm_messages[0]["content"] += plan_context
+                llm_messages[0] = {**llm_messages[0], "content": llm_messages[0]["content"] + plan_context}
             else:
                 llm_messages.insert(0, {"role": "system", "content": plan_context})
         
@@ -925,12 +925,8 @@ async def handle_inbound_message_sync(
             message_id=outbound_msg_id,
         )
         
-        # Update conversation stats
-        await update_conversation_stats(
-            tenant_id=tenant_id,
-            conversation_id=conversation_id,
-            tool_calls=tool_calls_executed,
-        )
+        # Conversation stats (message / tool call counts) are maintained by
+        # database triggers on messages and tool_call_logs
         
         total_latency_ms = int((time.time() - start_time) * 1000)
         
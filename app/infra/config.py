@@ -33,6 +33,22 @@ class Config:
         )
     )
     
+    # Shared connection pool (one per process; async callers reach it via
+    # worker threads, so size it for the thread pool plus request handlers)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    
+    # Tenant batches computed at the same time by the KPI job; keep well below
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW so API requests still get connections
+    KPI_CONCURRENCY: int = int(os.getenv("KPI_CONCURRENCY", "8"))
+    
+    # Optional admin database role with BYPASSRLS, used by cross-tenant system
+    # jobs (e.g. KPI computation) instead of toggling row_security per query
+    ADMIN_DATABASE_URL: Optional[str] = get_secret_lazy(
+        os.getenv("ADMIN_DATABASE_URL_REF", ""),
+        fallback=os.getenv("ADMIN_DATABASE_URL")
+    )
+    
     # OpenAI - support vault:// or aws:// references
     OPENAI_API_KEY: Optional[str] = get_secret_lazy(
         os.getenv("OPENAI_API_KEY_REF", ""),
@@ -2,27 +2,59 @@
 
 from contextlib import contextmanager
 from typing import Generator, Optional
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
 
 from app.infra.config import config
 
 
-# Create engine with connection pooling
+# Create engine with connection pooling. This is the single pool for the
+# process: async code paths run their queries through asyncio.to_thread
+# against it rather than opening a second (async) pool.
 engine = create_engine(
     config.DATABASE_URL,
     poolclass=QueuePool,
-    pool_size=10,  # Number of connections to maintain
-    max_overflow=20,  # Max connections beyond pool_size
+    pool_size=config.DB_POOL_SIZE,  # Number of connections to maintain
+    max_overflow=config.DB_MAX_OVERFLOW,  # Max connections beyond pool_size
     pool_timeout=30,  # Seconds to wait for connection from pool
-    pool_recycle=3600,  # Recycle connections after 1 hour
+    pool_recycle=1800,  # Recycle connections after 30 minutes
     pool_pre_ping=True,  # Verify connections before using
+    pool_use_lifo=True,  # Reuse the most recent connection; idle extras can time out
     echo=config.DEBUG,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Transaction-local equivalent of SET LOCAL that accepts a bind parameter
+_SQL_SET_TENANT = text("SELECT set_config('app.current_tenant_id', :tenant_id, true)")
+
+
+@event.listens_for(SessionLocal, "after_begin")
+def _set_tenant_on_begin(session, transaction, connection):
+    """Apply the session's tenant to every transaction it begins (for RLS)."""
+    tenant_id = session.info.get("tenant_id")
+    if tenant_id:
+        connection.execute(_SQL_SET_TENANT, {"tenant_id": str(tenant_id)})
+
+# Engine for the BYPASSRLS admin role (only if ADMIN_DATABASE_URL is set);
+# used by cross-tenant system jobs, which run few concurrent sessions
+if config.ADMIN_DATABASE_URL:
+    admin_engine = create_engine(
+        config.ADMIN_DATABASE_URL,
+        poolclass=QueuePool,
+        pool_size=5,
+        max_overflow=5,
+        pool_timeout=30,
+        pool_recycle=3600,
+        pool_pre_ping=True,
+        echo=config.DEBUG,
+    )
+    AdminSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=admin_engine)
+else:
+    admin_engine = None
+    AdminSessionLocal = None
+
 
 @contextmanager
 def get_db_session(tenant_id: Optional[str] = None) -> Generator[Session, None, None]:
@@ -31,13 +63,45 @@ def get_db_session(tenant_id: Optional[str] = None) -> Generator[Session, None,
     
     Sets app.current_tenant_id for RLS enforcement.
     Must be called with tenant_id for tenant-scoped operations.
+    
+    The tenant is applied transaction-locally at the start of each
+    transaction the session begins (including after a commit), so it costs
+    no separate commit and never leaks to the next user of the pooled
+    connection.
     """
-    session = SessionLocal()
+    session = SessionLocal(info={"tenant_id": tenant_id} if tenant_id else {})
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+@contextmanager
+def get_admin_db_session() -> Generator[Session, None, None]:
+    """
+    Get a database session that is not subject to RLS.
+    
+    SECURITY: Only for system/admin operations (scheduled jobs, internal
+    tasks) that must read across tenants. Never use it for a request made
+    on behalf of a tenant.
+    
+    Uses the BYPASSRLS role from ADMIN_DATABASE_URL when configured;
+    otherwise falls back to the default engine with row_security disabled
+    for the current transaction only.
+    """
+    if AdminSessionLocal is not None:
+        session = AdminSessionLocal()
+    else:
+        session = SessionLocal()
     try:
-        if tenant_id:
-            # Set tenant context for RLS
-            session.execute(text("SET app.current_tenant_id = :tenant_id"), {"tenant_id": tenant_id})
-            session.commit()  # Commit the SET statement
+        if AdminSessionLocal is None:
+            # SET LOCAL is scoped to the transaction; callers that commit
+            # mid-session start a new transaction with RLS enforced again
+            session.execute(text("SET LOCAL row_security = off"))
         
         yield session
         session.commit()
@@ -27,6 +27,19 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         return response
 
 
+class TaskCacheMiddleware(BaseHTTPMiddleware):
+    """Middleware to scope the agentic task cache to a single request."""
+    
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        from app.services.agentic_task_manager import begin_task_cache_scope, end_task_cache_scope
+        
+        token = begin_task_cache_scope()
+        try:
+            return await call_next(request)
+        finally:
+            end_task_cache_scope(token)
+
+
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """Middleware to log request/response details."""
     
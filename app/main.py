@@ -32,11 +32,26 @@ async def lifespan(app: FastAPI):
     from app.infra.logging import app_logger
     app_logger.info("Application starting up")
     
+    # Background writer for buffered KB sync heartbeats
+    from app.services.kb_sync_service import run_sync_mark_flusher
+    sync_mark_flusher = asyncio.create_task(run_sync_mark_flusher())
+    
     yield
     
     # Shutdown
     app_logger.info("Application shutting down")
     
+    # Stop the background flusher (it flushes anything still queued)
+    sync_mark_flusher.cancel()
+    try:
+        await sync_mark_flusher
+    except asyncio.CancelledError:
+        pass
+    
+    # Close pooled HTTP connections to OpenAI
+    from app.services.vector_store_service import vector_store_service
+    await vector_store_service.aclose()
+    
     # Close database connections
     from app.infra.database import engine
     engine.dispose()
@@ -134,10 +149,11 @@ app = FastAPI(
 )
 
 # Setup middleware
-from app.infra.middleware import RequestIDMiddleware, RequestLoggingMiddleware, setup_cors
+from app.infra.middleware import RequestIDMiddleware, RequestLoggingMiddleware, TaskCacheMiddleware, setup_cors
 from app.infra.timeout import TimeoutMiddleware, REQUEST_TIMEOUT
 
 app.add_middleware(RequestIDMiddleware)
+app.add_middleware(TaskCacheMiddleware)
 app.add_middleware(RequestLoggingMiddleware)
 app.add_middleware(TimeoutMiddleware, timeout=REQUEST_TIMEOUT)
 setup_cors(app)
@@ -1,7 +1,7 @@
 """Canonical tool definition model."""
 
 from pydantic import BaseModel, Field
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, FrozenSet, List, Optional
 
 
 class ToolDefinition(BaseModel):
@@ -21,8 +21,8 @@ class ToolDefinition(BaseModel):
         default=False,
         description="If True, this tool requires user context validation and parameter override"
     )
-    user_context_params: List[str] = Field(
-        default_factory=list,
+    user_context_params: FrozenSet[str] = Field(
+        default_factory=frozenset,
         description="Parameter names that must be overridden with user context (e.g., ['customer_id', 'user_id'])"
     )
 
@@ -1,9 +1,10 @@
 """Agentic task manager for state persistence and resumption."""
 
+import copy
 import json
 import logging
-import uuid
-from typing import Dict, Any, Optional, List
+from contextvars import ContextVar, Token
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 from sqlalchemy import text
 from app.models.tenant import TenantContext
@@ -11,6 +12,38 @@ from app.infra.database import get_db_session
 
 logger = logging.getLogger(__name__)
 
+# Serialized initial state for new tasks
+_EMPTY_JSONB = "{}"
+
+# Request-scoped cache of get_task results keyed by (tenant_id, task_id).
+# Disabled (None) unless a request scope is opened via begin_task_cache_scope,
+# so background workers always read through to the database.
+_task_cache: ContextVar[Optional[Dict[Tuple[str, str], Dict[str, Any]]]] = ContextVar(
+    "agentic_task_cache", default=None
+)
+
+
+def begin_task_cache_scope() -> Token:
+    """
+    Start a fresh task cache for the current request.
+    
+    Returns:
+        Token to pass to end_task_cache_scope
+    """
+    return _task_cache.set({})
+
+
+def end_task_cache_scope(token: Token) -> None:
+    """Discard the task cache opened by begin_task_cache_scope."""
+    _task_cache.reset(token)
+
+
+def _invalidate_cached_task(tenant_id: str, task_id: str) -> None:
+    """Drop a task from the request cache after it has been mutated."""
+    cache = _task_cache.get()
+    if cache is not None:
+        cache.pop((tenant_id, task_id), None)
+
 
 async def create_task(
     tenant_ctx: TenantContext,
@@ -28,39 +61,44 @@ async def create_task(
         conversation_id: Optional conversation ID
     
     Returns:
-        Dict with task_id, status, and metadata
+        Dict with task_id, status, created_at/updated_at, and metadata
     """
-    task_id = str(uuid.uuid4())
     with get_db_session(tenant_ctx.tenant_id) as session:
-        session.execute(
+        result = session.execute(
             text("""
                 INSERT INTO agentic_tasks (
-                    id, tenant_id, conversation_id, plan_id,
+                    tenant_id, conversation_id, plan_id,
                     goal, current_step, state, status
                 ) VALUES (
-                    :id, :tenant_id, :conversation_id, :plan_id,
+                    :tenant_id, :conversation_id, :plan_id,
                     :goal, :current_step, CAST(:state AS jsonb), :status
                 )
+                RETURNING id, created_at, updated_at
             """),
             {
-                "id": task_id,
                 "tenant_id": tenant_ctx.tenant_id,
                 "conversation_id": conversation_id,
                 "plan_id": plan_id,
                 "goal": goal,
                 "current_step": 0,
-                "state": json.dumps({}),
+                "state": _EMPTY_JSONB,
                 "status": "planning" if plan_id else "executing",
             }
         )
+        row = result.fetchone()
         session.commit()
     
     return {
-        "task_id": task_id,
+        # id comes from the column default (gen_random_uuid())
+        "task_id": str(row.id),
         "goal": goal,
         "plan_id": plan_id,
+        "conversation_id": conversation_id,
         "status": "planning" if plan_id else "executing",
         "current_step": 0,
+        "state": {},
+        "created_at": row.created_at.isoformat(),
+        "updated_at": row.updated_at.isoformat(),
     }
 
 
@@ -82,10 +120,16 @@ async def update_task_state(
         status: Optional status update
     """
     with get_db_session(tenant_ctx.tenant_id) as session:
+        # The state is compared against the stored value in the database, so
+        # an unchanged (possibly TOASTed) jsonb value is kept as-is rather
+        # than rewritten, whichever process wrote it last
         update_query = """
             UPDATE agentic_tasks
             SET current_step = :current_step,
-                state = CAST(:state AS jsonb),
+                state = CASE
+                    WHEN state IS DISTINCT FROM CAST(:state AS jsonb) THEN CAST(:state AS jsonb)
+                    ELSE state
+                END,
                 updated_at = now()
         """
         params = {
@@ -103,6 +147,65 @@ async def update_task_state(
         
         session.execute(text(update_query), params)
         session.commit()
+    
+    _invalidate_cached_task(tenant_ctx.tenant_id, task_id)
+
+
+async def bulk_update_task_states(
+    tenant_ctx: TenantContext,
+    updates: List[Tuple[str, int, Dict[str, Any], Optional[str]]],
+) -> int:
+    """
+    Update the state of several tasks in one statement and one commit.
+    
+    If a task appears more than once, its last update wins.
+    
+    Args:
+        tenant_ctx: TenantContext
+        updates: (task_id, current_step, state, status) tuples; a status of
+            None leaves the task's status unchanged
+    
+    Returns:
+        Number of tasks updated
+    """
+    latest: Dict[str, Tuple[int, Dict[str, Any], Optional[str]]] = {}
+    for task_id, current_step, state, status in updates:
+        latest[task_id] = (current_step, state, status)
+    
+    if not latest:
+        return 0
+    
+    params: Dict[str, Any] = {"tenant_id": tenant_ctx.tenant_id}
+    values_rows = []
+    for i, (task_id, (current_step, state, status)) in enumerate(latest.items()):
+        values_rows.append(
+            f"(CAST(:id_{i} AS uuid), CAST(:step_{i} AS integer), "
+            f"CAST(:state_{i} AS jsonb), CAST(:status_{i} AS varchar))"
+        )
+        params[f"id_{i}"] = task_id
+        params[f"step_{i}"] = current_step
+        params[f"state_{i}"] = json.dumps(state)
+        params[f"status_{i}"] = status
+    
+    with get_db_session(tenant_ctx.tenant_id) as session:
+        result = session.execute(
+            text(f"""
+                UPDATE agentic_tasks
+                SET current_step = v.current_step,
+                    state = v.state,
+                    status = COALESCE(v.status, agentic_tasks.status),
+                    updated_at = now()
+                FROM (VALUES {", ".join(values_rows)}) AS v(id, current_step, state, status)
+                WHERE agentic_tasks.id = v.id AND agentic_tasks.tenant_id = :tenant_id
+            """),
+            params
+        )
+        session.commit()
+    
+    for task_id in latest:
+        _invalidate_cached_task(tenant_ctx.tenant_id, task_id)
+    
+    return result.rowcount
 
 
 async def get_task(
@@ -119,6 +222,12 @@ async def get_task(
     Returns:
         Task dict or None if not found
     """
+    cache = _task_cache.get()
+    cache_key = (tenant_ctx.tenant_id, task_id)
+    if cache is not None and cache_key in cache:
+        # Callers may mutate the returned dict, so hand out a copy
+        return copy.deepcopy(cache[cache_key])
+    
     with get_db_session(tenant_ctx.tenant_id) as session:
         row = session.execute(
             text("""
@@ -133,7 +242,7 @@ async def get_task(
         if not row:
             return None
         
-        return {
+        task = {
             "task_id": str(row.id),
             "tenant_id": str(row.tenant_id),
             "conversation_id": str(row.conversation_id) if row.conversation_id else None,
@@ -146,6 +255,10 @@ async def get_task(
             "updated_at": row.updated_at.isoformat() if row.updated_at else None,
             "completed_at": row.completed_at.isoformat() if row.completed_at else None,
         }
+    
+    if cache is not None:
+        cache[cache_key] = copy.deepcopy(task)
+    return task
 
 
 async def resume_task(
@@ -183,6 +296,8 @@ async def resume_task(
         )
         session.commit()
     
+    _invalidate_cached_task(tenant_ctx.tenant_id, task_id)
+    
     task["status"] = "executing"
     return task
 
@@ -218,6 +333,8 @@ async def cancel_task(
             {"task_id": task_id, "tenant_id": tenant_ctx.tenant_id}
         )
         session.commit()
+    
+    _invalidate_cached_task(tenant_ctx.tenant_id, task_id)
 
 
 async def complete_task(
@@ -253,6 +370,8 @@ async def complete_task(
         
         session.execute(text(update_query), params)
         session.commit()
+    
+    _invalidate_cached_task(tenant_ctx.tenant_id, task_id)
 
 
 async def list_tasks(
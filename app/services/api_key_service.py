@@ -1,6 +1,10 @@
 """API key management service with secure key generation and hashing."""
 
+import asyncio
+import base64
+import binascii
 import secrets
+import zlib
 import bcrypt
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
@@ -9,16 +13,55 @@ from sqlalchemy import text
 from app.infra.database import get_db_session
 
 
+# Key layout: base64url(checksum(4 bytes) + random body(32 bytes)) = 48 characters
+_KEY_BODY_BYTES = 32
+_KEY_CHECKSUM_BYTES = 4
+_KEY_LENGTH = 48
+
+
+def _key_checksum(body: bytes) -> bytes:
+    """CRC32 of the random key body, big-endian."""
+    return zlib.crc32(body).to_bytes(_KEY_CHECKSUM_BYTES, "big")
+
+
 def generate_api_key() -> str:
     """
     Generate a secure random API key.
     
+    The key embeds a checksum of its random body so malformed keys can be
+    rejected without a database lookup (see has_valid_key_checksum).
+    
+    Returns:
+        A secure random API key string (48 characters, URL-safe)
+    """
+    # 32 bytes (256 bits) of random data, prefixed with a 4-byte checksum
+    body = secrets.token_bytes(_KEY_BODY_BYTES)
+    raw = _key_checksum(body) + body
+    # 36 bytes encode to exactly 48 base64 characters, so there is no padding
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def has_valid_key_checksum(api_key: str) -> bool:
+    """
+    Check the embedded checksum of a key produced by generate_api_key.
+    
+    Keys of any other length predate the checksummed format and are not
+    checked here; they are always passed on to hash verification.
+    
+    Args:
+        api_key: Plain text API key
+    
     Returns:
-        A secure random API key string (64 characters, URL-safe)
+        False if the key has the checksummed length but a bad checksum
     """
-    # Generate 48 bytes (384 bits) of random data
-    # Encode as base64 URL-safe string (64 characters)
-    return secrets.token_urlsafe(48)
+    if len(api_key) != _KEY_LENGTH:
+        return True
+    try:
+        raw = base64.urlsafe_b64decode(api_key.encode("ascii"))
+    except (binascii.Error, UnicodeEncodeError, ValueError):
+        return False
+    checksum, body = raw[:_KEY_CHECKSUM_BYTES], raw[_KEY_CHECKSUM_BYTES:]
+    return checksum == _key_checksum(body)
 
 
 def hash_api_key(api_key: str) -> str:
@@ -66,9 +109,10 @@ def get_key_prefix(api_key: str) -> str:
         api_key: Full API key
     
     Returns:
-        First 8 characters of the key (for display/identification)
+        First 8 characters of the key (for display/identification);
+        shorter keys are returned whole
     """
-    return api_key[:8] if len(api_key) >= 8 else api_key
+    return api_key[:8]
 
 
 async def create_api_key(
@@ -101,7 +145,8 @@ async def create_api_key(
     """
     # Generate new API key
     api_key = generate_api_key()
-    key_hash = hash_api_key(api_key)
+    # bcrypt at cost 12 takes hundreds of ms; keep it off the event loop
+    key_hash = await asyncio.to_thread(hash_api_key, api_key)
     key_prefix = get_key_prefix(api_key)
     
     # Calculate expiration
@@ -290,6 +335,10 @@ async def verify_and_get_tenant_id(api_key: str, db: Session) -> Optional[str]:
     Returns:
         Tenant ID if key is valid, None otherwise
     """
+    # Reject keys with a broken checksum before touching the database
+    if not has_valid_key_checksum(api_key):
+        return None
+    
     # Get key prefix for efficient lookup
     key_prefix = get_key_prefix(api_key)
     
@@ -305,9 +354,10 @@ async def verify_and_get_tenant_id(api_key: str, db: Session) -> Optional[str]:
         {"key_prefix": key_prefix}
     ).fetchall()
     
-    # Verify against each matching key (should be very few due to prefix)
+    # Verify against each matching key (should be very few due to prefix).
+    # bcrypt checks run in a worker thread so they don't block the event loop.
     for row in rows:
-        if verify_api_key(api_key, row.key_hash):
+        if await asyncio.to_thread(verify_api_key, api_key, row.key_hash):
             # Update last_used_at
             db.execute(
                 text("""
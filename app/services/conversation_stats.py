@@ -6,113 +6,89 @@ from sqlalchemy import text
 from app.infra.database import get_db_session
 
 
+# total_messages / tool_calls are maintained incrementally by triggers on
+# messages and tool_call_logs (migrations/013_conversation_stats_counters.sql).
+# Regular updates only override counts that are passed explicitly.
+_UPSERT_STATS_SQL = text("""
+    INSERT INTO conversation_stats (
+        tenant_id, conversation_id, total_messages, tool_calls, resolved
+    ) VALUES (
+        :tenant_id,
+        :conversation_id,
+        COALESCE(CAST(:total_messages AS INTEGER), 0),
+        COALESCE(CAST(:tool_calls AS INTEGER), 0),
+        COALESCE(CAST(:resolved AS BOOLEAN), FALSE)
+    )
+    ON CONFLICT (conversation_id) DO UPDATE
+    SET total_messages = COALESCE(CAST(:total_messages AS INTEGER), conversation_stats.total_messages),
+        tool_calls = COALESCE(CAST(:tool_calls AS INTEGER), conversation_stats.tool_calls),
+        resolved = COALESCE(CAST(:resolved AS BOOLEAN), conversation_stats.resolved),
+        updated_at = now()
+""")
+
+# Reconciliation path: recomputes counts not provided from the source tables
+_RECOUNT_STATS_SQL = text("""
+    INSERT INTO conversation_stats (
+        tenant_id, conversation_id, total_messages, tool_calls, resolved
+    )
+    SELECT
+        :tenant_id,
+        :conversation_id,
+        COALESCE(
+            CAST(:total_messages AS INTEGER),
+            (SELECT COUNT(*) FROM messages
+             WHERE tenant_id = :tenant_id AND conversation_id = :conversation_id)
+        ),
+        COALESCE(
+            CAST(:tool_calls AS INTEGER),
+            (SELECT COUNT(*) FROM tool_call_logs
+             WHERE tenant_id = :tenant_id AND conversation_id = :conversation_id)
+        ),
+        COALESCE(CAST(:resolved AS BOOLEAN), FALSE)
+    ON CONFLICT (conversation_id) DO UPDATE
+    SET total_messages = EXCLUDED.total_messages,
+        tool_calls = EXCLUDED.tool_calls,
+        resolved = COALESCE(CAST(:resolved AS BOOLEAN), conversation_stats.resolved),
+        updated_at = now()
+""")
+
+
 async def update_conversation_stats(
     tenant_id: str,
     conversation_id: str,
     total_messages: Optional[int] = None,
     tool_calls: Optional[int] = None,
     resolved: Optional[bool] = None,
+    force_recount: bool = False,
 ) -> None:
     """
     Update conversation stats.
     
+    Runs as a single upsert so concurrent callers cannot race between
+    reading and writing the stats row. Message and tool call counts are
+    kept current by database triggers, so they are only recounted when
+    force_recount is set (admin/repair jobs).
+    
     Args:
         tenant_id: Tenant ID
         conversation_id: Conversation ID
-        total_messages: Optional message count (will be computed if None)
-        tool_calls: Optional tool call count (will be computed if None)
-        resolved: Optional resolved status
+        total_messages: Optional message count (existing value kept if None)
+        tool_calls: Optional tool call count (existing value kept if None)
+        resolved: Optional resolved status (existing value kept if None)
+        force_recount: Recompute counts not provided with COUNT(*) over
+            messages and tool_call_logs
     """
     with get_db_session(tenant_id) as session:
-        # Get current stats or create new
-        stats_row = session.execute(
-            text("""
-                SELECT id, total_messages, tool_calls, resolved
-                FROM conversation_stats
-                WHERE tenant_id = :tenant_id AND conversation_id = :conversation_id
-            """),
+        # conversation_id is UNIQUE on conversation_stats, so it is the conflict target
+        session.execute(
+            _RECOUNT_STATS_SQL if force_recount else _UPSERT_STATS_SQL,
             {
                 "tenant_id": tenant_id,
                 "conversation_id": conversation_id,
-            }
-        ).fetchone()
-        
-        # Compute values if not provided
-        if total_messages is None:
-            msg_count = session.execute(
-                text("""
-                    SELECT COUNT(*) FROM messages
-                    WHERE tenant_id = :tenant_id AND conversation_id = :conversation_id
-                """),
-                {
-                    "tenant_id": tenant_id,
-                    "conversation_id": conversation_id,
-                }
-            ).scalar()
-            total_messages = msg_count or 0
-        
-        if tool_calls is None:
-            tool_count = session.execute(
-                text("""
-                    SELECT COUNT(*) FROM tool_call_logs
-                    WHERE tenant_id = :tenant_id AND conversation_id = :conversation_id
-                """),
-                {
-                    "tenant_id": tenant_id,
-                    "conversation_id": conversation_id,
-                }
-            ).scalar()
-            tool_calls = tool_count or 0
-        
-        if stats_row:
-            # Update existing
-            update_fields = {
-                "tenant_id": tenant_id,
-                "conversation_id": conversation_id,
                 "total_messages": total_messages,
                 "tool_calls": tool_calls,
-                "updated_at": "now()",
+                "resolved": resolved,
             }
-            
-            if resolved is not None:
-                update_fields["resolved"] = resolved
-            
-            session.execute(
-                text("""
-                    UPDATE conversation_stats
-                    SET total_messages = :total_messages,
-                        tool_calls = :tool_calls,
-                        resolved = COALESCE(:resolved, resolved),
-                        updated_at = now()
-                    WHERE tenant_id = :tenant_id AND conversation_id = :conversation_id
-                """),
-                {
-                    "tenant_id": tenant_id,
-                    "conversation_id": conversation_id,
-                    "total_messages": total_messages,
-                    "tool_calls": tool_calls,
-                    "resolved": resolved,
-                }
-            )
-        else:
-            # Insert new
-            session.execute(
-                text("""
-                    INSERT INTO conversation_stats (
-                        tenant_id, conversation_id, total_messages, tool_calls, resolved
-                    ) VALUES (
-                        :tenant_id, :conversation_id, :total_messages, :tool_calls, :resolved
-                    )
-                """),
-                {
-                    "tenant_id": tenant_id,
-                    "conversation_id": conversation_id,
-                    "total_messages": total_messages,
-                    "tool_calls": tool_calls,
-                    "resolved": resolved or False,
-                }
-            )
+        )
         
         session.commit()
-
-
@@ -1,10 +1,14 @@
 """Cost calculation for LLM API calls."""
 
-from typing import Dict, Any, Optional
+import sys
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
 
 
 # Pricing per 1M tokens (as of 2025-01, adjust as needed)
-PRICING = {
+_PRICING_TABLE = {
     "openai": {
         "gpt-4o": {"input": 2.50, "output": 10.00},
         "gpt-4o-mini": {"input": 0.15, "output": 0.60},
@@ -24,6 +28,62 @@ PRICING = {
 }
 
 
+def _freeze_pricing(
+    table: Dict[str, Dict[str, Dict[str, float]]],
+) -> Mapping[str, Mapping[str, Mapping[str, float]]]:
+    """Return a read-only copy of a pricing table with interned provider/model keys."""
+    return MappingProxyType({
+        sys.intern(provider): MappingProxyType({
+            sys.intern(model): MappingProxyType(dict(model_pricing))
+            for model, model_pricing in models.items()
+        })
+        for provider, models in table.items()
+    })
+
+
+# Read-only at runtime; edit _PRICING_TABLE to change prices
+PRICING = _freeze_pricing(_PRICING_TABLE)
+
+# Used when neither the provider nor its "default" entry is known
+_FALLBACK_PRICING = MappingProxyType({"input": 0.50, "output": 1.50})
+
+
+def _build_rate_tables() -> Tuple[Dict[Tuple[str, str], int], np.ndarray, np.ndarray]:
+    """
+    Flatten PRICING into per-token rate arrays for vectorized cost lookups.
+    
+    Index 0 holds the global fallback rate; every (provider, model) pair,
+    including each provider's "default" entry, gets its own row.
+    
+    Returns:
+        Tuple of ({(provider, model): index}, input rates, output rates)
+    """
+    index: Dict[Tuple[str, str], int] = {}
+    rates_in = [_FALLBACK_PRICING["input"]]
+    rates_out = [_FALLBACK_PRICING["output"]]
+    for provider, models in PRICING.items():
+        for model, model_pricing in models.items():
+            index[(provider, model)] = len(rates_in)
+            rates_in.append(model_pricing["input"])
+            rates_out.append(model_pricing["output"])
+    
+    # Rates are stored per token so the batch path is a single multiply-add
+    rate_in = np.asarray(rates_in, dtype=np.float64) / 1_000_000
+    rate_out = np.asarray(rates_out, dtype=np.float64) / 1_000_000
+    return index, rate_in, rate_out
+
+
+_RATE_INDEX, _RATE_TABLE_IN, _RATE_TABLE_OUT = _build_rate_tables()
+
+
+def _rate_index(provider: str, model: str) -> int:
+    """Resolve (provider, model) to a rate-table row, mirroring calculate_llm_cost fallbacks."""
+    idx = _RATE_INDEX.get((provider, model))
+    if idx is None:
+        idx = _RATE_INDEX.get((provider, "default"), 0)
+    return idx
+
+
 def calculate_llm_cost(
     provider: str,
     model: str,
@@ -45,7 +105,7 @@ def calculate_llm_cost(
         Cost in USD
     """
     provider_pricing = PRICING.get(provider, {})
-    model_pricing = provider_pricing.get(model, provider_pricing.get("default", {"input": 0.50, "output": 1.50}))
+    model_pricing = provider_pricing.get(model, provider_pricing.get("default", _FALLBACK_PRICING))
     
     if prompt_tokens is not None and completion_tokens is not None:
         input_cost = (prompt_tokens / 1_000_000) * model_pricing["input"]
@@ -62,6 +122,46 @@ def calculate_llm_cost(
     return 0.0
 
 
+def calculate_llm_cost_batch(
+    providers: Iterable[str],
+    models: Iterable[str],
+    prompt_tokens: Iterable[int],
+    completion_tokens: Iterable[int],
+) -> np.ndarray:
+    """
+    Calculate costs for many LLM API calls at once.
+    
+    Intended for bulk rollups (per-conversation or per-tenant) where calling
+    calculate_llm_cost row by row is too slow. Pricing fallbacks match
+    calculate_llm_cost; sum the result with ``costs.sum()``.
+    
+    Args:
+        providers: Provider per call ('openai' or 'gemini')
+        models: Model name per call
+        prompt_tokens: Input tokens per call
+        completion_tokens: Output tokens per call
+    
+    Returns:
+        Contiguous float64 array of costs in USD, one per call
+    """
+    # zip would silently drop unmatched providers or models; check first
+    providers = list(providers)
+    models = list(models)
+    prompt = np.asarray(prompt_tokens, dtype=np.float64)
+    completion = np.asarray(completion_tokens, dtype=np.float64)
+    if not (len(providers) == len(models) and prompt.shape == completion.shape == (len(models),)):
+        raise ValueError("providers, models, prompt_tokens and completion_tokens must have the same length")
+    
+    idx = np.fromiter(
+        (_rate_index(provider, model) for provider, model in zip(providers, models)),
+        dtype=np.intp,
+        count=len(models),
+    )
+    costs = prompt * _RATE_TABLE_IN[idx]
+    costs += completion * _RATE_TABLE_OUT[idx]
+    return np.ascontiguousarray(costs)
+
+
 def calculate_tool_cost(
     provider: str,
     tool_name: str,
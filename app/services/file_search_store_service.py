@@ -1,13 +1,34 @@
 """Gemini file search store service for managing file search stores and files."""
 
+import io
 import logging
+import mimetypes
+import threading
 import time
 import asyncio
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
+import httpx
 from app.infra.config import config
 
+try:
+    from google import genai
+    HAS_GENAI = True
+except ImportError:
+    genai = None
+    HAS_GENAI = False
+
 logger = logging.getLogger(__name__)
 
+# Connection pool for the Gemini client; uploads run concurrently from worker
+# threads, so keep enough idle connections to avoid repeated TLS handshakes
+GEMINI_MAX_CONNECTIONS = 64
+GEMINI_MAX_KEEPALIVE_CONNECTIONS = 32
+GEMINI_HTTP_TIMEOUT_SECONDS = 60
+
+# Process-wide Gemini client, shared by all service instances and worker threads
+_client = None
+_client_lock = threading.Lock()
+
 
 class FileSearchStoreService:
     """Service for managing Gemini file search stores."""
@@ -17,15 +38,9 @@ class FileSearchStoreService:
     
     @property
     def client(self):
-        """Lazy initialization of Gemini client."""
+        """Lazy, thread-safe initialization of the shared Gemini client."""
         if self._client is None:
-            if not config.GEMINI_API_KEY:
-                raise ValueError("GEMINI_API_KEY not configured")
-            try:
-                from google import genai
-                self._client = genai.Client(api_key=config.GEMINI_API_KEY)
-            except ImportError:
-                raise ImportError("google-genai SDK not installed. Install with: pip install google-genai")
+            self._client = _get_shared_client()
         return self._client
     
     def create_file_search_store(self, display_name: str, tenant_id: str) -> Dict[str, Any]:
@@ -140,33 +155,85 @@ class FileSearchStoreService:
             file_path: Path to file to upload
             display_name: Optional display name
         
+        Returns:
+            Dict with file_name and other metadata
+        """
+        return await self._upload(
+            store_name,
+            file_path,
+            display_name or file_path.split('/')[-1],
+        )
+    
+    async def upload_file_from_content(self, store_name: str, content: bytes, filename: str) -> Dict[str, Any]:
+        """
+        Upload file content to file search store.
+        
+        The content is streamed from memory; nothing is written to disk.
+        
+        Args:
+            store_name: Store name
+            content: File content as bytes
+            filename: Filename
+        
+        Returns:
+            Dict with file_name and other metadata
+        """
+        # In-memory streams carry no path, so the SDK needs an explicit mime type
+        mime_type = mimetypes.guess_type(filename)[0] or "text/plain"
+        return await self._upload(store_name, io.BytesIO(content), filename, mime_type)
+    
+    async def _upload(
+        self,
+        store_name: str,
+        file: Union[str, io.IOBase],
+        display_name: str,
+        mime_type: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Upload a file path or binary stream and wait for the import to finish.
+        
+        Args:
+            store_name: Store name
+            file: Path to file or seekable binary stream
+            display_name: Display name for the uploaded file
+            mime_type: Mime type (required for streams)
+        
         Returns:
             Dict with file_name and other metadata
         """
         try:
             client = self.client
             
-            # Upload and import file
-            operation = client.file_search_stores.upload_to_file_search_store(
-                file=file_path,
+            upload_config = {'display_name': display_name}
+            if mime_type:
+                upload_config['mime_type'] = mime_type
+            
+            # Upload and import file (blocking SDK calls run in a worker thread
+            # so concurrent uploads to other providers are not stalled)
+            operation = await asyncio.to_thread(
+                client.file_search_stores.upload_to_file_search_store,
+                file=file,
                 file_search_store_name=store_name,
-                config={'display_name': display_name or file_path.split('/')[-1]}
+                config=upload_config
             )
             
-            # Wait for operation to complete
+            # Wait for operation to complete, backing off from 200ms to 5s
+            # so small files are not held up by a fixed poll interval
             max_wait = 300  # 5 minutes max
-            wait_time = 0
+            wait_time = 0.0
+            delay = 0.2
             while wait_time < max_wait:
                 if operation.done:
                     break
                 
-                await asyncio.sleep(5)
-                wait_time += 5
+                await asyncio.sleep(delay)
+                wait_time += delay
+                delay = min(delay * 2, 5.0)
                 # Refresh operation status
-                operation = client.operations.get(operation)
+                operation = await asyncio.to_thread(client.operations.get, operation)
             
             if not operation.done:
-                logger.warning(f"File upload timed out for {file_path}, but may still be processing")
+                logger.warning(f"File upload timed out for {display_name}, but may still be processing")
             
             # Extract file name from operation result if available
             file_name = None
@@ -179,34 +246,11 @@ class FileSearchStoreService:
                 "status": "completed" if operation.done else "processing",
             }
         except Exception as e:
-            logger.error(f"Error uploading file to file search store {store_name}: {e}", exc_info=True)
+            # Callers log upload failures per document; keep the traceback at DEBUG
+            logger.error("Error uploading %s to file search store %s: %s", display_name, store_name, e)
+            logger.debug("Upload failure traceback", exc_info=True)
             raise
     
-    async def upload_file_from_content(self, store_name: str, content: bytes, filename: str) -> Dict[str, Any]:
-        """
-        Upload file content to file search store.
-        
-        Args:
-            store_name: Store name
-            content: File content as bytes
-            filename: Filename
-        
-        Returns:
-            Dict with file_name and other metadata
-        """
-        import tempfile
-        import os
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as tmp_file:
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
-        
-        try:
-            return await self.upload_file(store_name, tmp_path, filename)
-        finally:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-    
     async def list_files(self, store_name: str, limit: int = 100) -> List[Dict[str, Any]]:
         """
         List files in file search store.
@@ -254,6 +298,30 @@ class FileSearchStoreService:
             return False
 
 
+def _get_shared_client():
+    """Build the process-wide Gemini client once (double-checked locking)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if not config.GEMINI_API_KEY:
+                    raise ValueError("GEMINI_API_KEY not configured")
+                if not HAS_GENAI:
+                    raise ImportError("google-genai SDK not installed. Install with: pip install google-genai")
+                http_client = httpx.Client(
+                    timeout=GEMINI_HTTP_TIMEOUT_SECONDS,
+                    limits=httpx.Limits(
+                        max_connections=GEMINI_MAX_CONNECTIONS,
+                        max_keepalive_connections=GEMINI_MAX_KEEPALIVE_CONNECTIONS,
+                    ),
+                )
+                _client = genai.Client(
+                    api_key=config.GEMINI_API_KEY,
+                    http_options={"httpx_client": http_client},
+                )
+    return _client
+
+
 # Global instance
 file_search_store_service = FileSearchStoreService()
 
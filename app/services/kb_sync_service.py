@@ -1,11 +1,16 @@
 """Knowledge base sync service - orchestrates multi-provider document syncing."""
 
+import asyncio
+import contextlib
 import logging
+import time
 import uuid
-from typing import List, Dict, Any, Optional
+import weakref
+from collections import deque
+from typing import Deque, List, Dict, Any, Optional, Tuple, Union
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from datetime import datetime
+from datetime import datetime, timezone
 
 from app.infra.database import get_db_session
 from app.services.vector_store_service import vector_store_service
@@ -14,10 +19,177 @@ from app.services.tool_mapping_service import get_provider_from_tool_name
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip when streaming a KB's documents
+DOCUMENT_FETCH_BATCH_SIZE = 64
+
+
+# Statements are built once at import so SQLAlchemy reuses their compiled form
+_SQL_GET_ACTIVE_PROVIDERS = text("""
+    SELECT provider, store_id, sync_status
+    FROM kb_provider_sync
+    WHERE kb_id = :kb_id AND is_active = TRUE AND sync_status = 'enabled'
+""")
+
+# Optional provider filter; pass providers=None to select every active provider
+_SQL_GET_SYNC_TARGETS = text("""
+    SELECT provider, store_id
+    FROM kb_provider_sync
+    WHERE kb_id = :kb_id AND is_active = TRUE AND sync_status = 'enabled'
+      AND (CAST(:providers AS text[]) IS NULL OR provider = ANY(CAST(:providers AS text[])))
+""")
+
+_SQL_GET_SYNC_RECORDS = text("""
+    SELECT id, provider, store_id, sync_status
+    FROM kb_provider_sync
+    WHERE kb_id = :kb_id AND provider = ANY(:providers)
+""")
+
+_SQL_MARK_SYNC_ERRORS_BY_ID = text("""
+    UPDATE kb_provider_sync AS s
+    SET sync_status = 'error',
+        error_message = e.error_message,
+        updated_at = now()
+    FROM UNNEST(CAST(:ids AS uuid[]), CAST(:error_messages AS text[]))
+        AS e(id, error_message)
+    WHERE s.id = e.id
+""")
+
+_SQL_UPDATE_SYNC_STORES = text("""
+    UPDATE kb_provider_sync AS s
+    SET store_id = u.store_id,
+        sync_status = 'enabled',
+        is_active = TRUE,
+        updated_at = now()
+    FROM UNNEST(CAST(:ids AS uuid[]), CAST(:store_ids AS text[]))
+        AS u(id, store_id)
+    WHERE s.id = u.id
+""")
+
+# One multi-row insert for every new record, successful or failed
+_SQL_INSERT_SYNC_RECORDS = text("""
+    INSERT INTO kb_provider_sync (
+        id, kb_id, provider, is_active, sync_status, store_id, error_message
+    )
+    SELECT r.id, :kb_id, r.provider, r.is_active, r.sync_status, r.store_id, r.error_message
+    FROM UNNEST(
+        CAST(:ids AS uuid[]),
+        CAST(:providers AS text[]),
+        CAST(:is_active AS boolean[]),
+        CAST(:sync_statuses AS text[]),
+        CAST(:store_ids AS text[]),
+        CAST(:error_messages AS text[])
+    ) AS r(id, provider, is_active, sync_status, store_id, error_message)
+""")
+
+# Heartbeat for successful syncs, written in batches by flush_sync_marks.
+# synced_at is when the upload succeeded; the error message is cleared unless
+# the row was updated after that (e.g. a later failure recorded its error).
+_SQL_MARK_SYNCED = text("""
+    UPDATE kb_provider_sync AS s
+    SET last_sync_at = GREATEST(s.last_sync_at, m.synced_at),
+        error_message = CASE WHEN s.updated_at < m.synced_at THEN NULL ELSE s.error_message END,
+        updated_at = now()
+    FROM UNNEST(
+        CAST(:kb_ids AS uuid[]),
+        CAST(:providers AS text[]),
+        CAST(:synced_ats AS timestamptz[])
+    ) AS m(kb_id, provider, synced_at)
+    WHERE s.kb_id = m.kb_id AND s.provider = m.provider
+""")
+
+_SQL_MARK_SYNC_ERRORS = text("""
+    UPDATE kb_provider_sync AS s
+    SET sync_status = 'error',
+        error_message = e.error_message,
+        updated_at = now()
+    FROM UNNEST(CAST(:providers AS text[]), CAST(:error_messages AS text[]))
+        AS e(provider, error_message)
+    WHERE s.kb_id = :kb_id AND s.provider = e.provider
+""")
+
+_SQL_GET_KB = text("""
+    SELECT id, tenant_id, name
+    FROM knowledge_bases
+    WHERE id = :kb_id AND tenant_id = :tenant_id
+""")
+
+# Streamed through a server-side cursor so a large KB is never fully resident.
+# Bodies are fetched per document with _SQL_GET_DOCUMENT_CONTENT.
+_SQL_GET_DOCUMENTS = text("""
+    SELECT id, title
+    FROM rag_documents
+    WHERE tenant_id = :tenant_id
+      AND kb_name = :kb_name
+""").execution_options(stream_results=True, yield_per=DOCUMENT_FETCH_BATCH_SIZE)
+
+_SQL_GET_DOCUMENT_CONTENT = text("""
+    SELECT content
+    FROM rag_documents
+    WHERE id = :document_id
+""")
+
+# Remote store providers: (create store fn, key of the store id in its result)
+_CREATE_FNS = {
+    "openai_file": (vector_store_service.create_vector_store, "vector_store_id"),
+    "gemini_file": (file_search_store_service.create_file_search_store, "store_name"),
+}
+
+# Remote store providers: (upload fn, key of the file id in its result)
+_UPLOAD_FNS = {
+    "openai_file": (vector_store_service.upload_file_from_content, "file_id"),
+    "gemini_file": (file_search_store_service.upload_file_from_content, "file_name"),
+}
+
+# Internal RAG has no remote store - documents already live in our database
+_INTERNAL_PROVIDER = "internal_rag"
+
+# How long active-provider lookups for a KB are reused
+PROVIDERS_CACHE_TTL_SECONDS = 60
+
+# How often buffered last_sync_at heartbeats are written
+SYNC_MARK_FLUSH_INTERVAL_SECONDS = 2.0
+
+# Successful (tenant_id, kb_id, provider, synced_at) syncs awaiting their
+# heartbeat write
+_pending_sync_marks: Deque[Tuple[str, str, str, datetime]] = deque()
+
 
 class KBSyncService:
     """Service for syncing documents across multiple providers."""
     
+    def __init__(self):
+        # (tenant_id, kb_id) -> (cached_at, [(provider, store_id), ...])
+        self._providers_cache: Dict[Tuple[str, str], Tuple[float, List[Tuple[str, str]]]] = {}
+        # (kb_id, provider) -> lock serializing store creation for that pair.
+        # Weak values: an entry lives only while a call holds or waits on it.
+        self._ensure_locks: "weakref.WeakValueDictionary[Tuple[str, str], asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+    
+    def _get_active_providers(self, tenant_id: str, kb_id: str, db: Session) -> List[Tuple[str, str]]:
+        """
+        Get (provider, store_id) pairs for the KB's active, store-backed providers.
+        
+        Results are cached per KB for PROVIDERS_CACHE_TTL_SECONDS.
+        """
+        cache_key = (str(tenant_id), str(kb_id))
+        cached = self._providers_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < PROVIDERS_CACHE_TTL_SECONDS:
+            return cached[1]
+        
+        rows = db.execute(
+            _SQL_GET_ACTIVE_PROVIDERS,
+            {"kb_id": kb_id}
+        ).fetchall()
+        
+        targets = [(row.provider, row.store_id) for row in rows if row.store_id]
+        self._providers_cache[cache_key] = (time.monotonic(), targets)
+        return targets
+    
+    def invalidate_providers_cache(self, tenant_id: str, kb_id: str) -> None:
+        """Drop the cached active providers for a KB."""
+        self._providers_cache.pop((str(tenant_id), str(kb_id)), None)
+    
     async def ensure_provider_stores(
         self,
         tenant_id: str,
@@ -42,124 +214,156 @@ class KBSyncService:
         """
         store_ids = {}
         
-        for provider in enabled_providers:
-            try:
-                # Check if sync record exists
-                sync_record = db.execute(
-                    text("""
-                        SELECT id, store_id, sync_status
-                        FROM kb_provider_sync
-                        WHERE kb_id = :kb_id AND provider = :provider
-                    """),
-                    {"kb_id": kb_id, "provider": provider}
-                ).fetchone()
-                
-                if sync_record and sync_record.store_id:
-                    # Store already exists
-                    store_ids[provider] = sync_record.store_id
-                    continue
-                
-                # Create store based on provider
-                if provider == "openai_file":
-                    store_info = vector_store_service.create_vector_store(
-                        name=f"{kb_name} - {tenant_id[:8]}",
-                        tenant_id=tenant_id
-                    )
-                    store_id = store_info["vector_store_id"]
-                    
-                elif provider == "gemini_file":
-                    store_info = file_search_store_service.create_file_search_store(
-                        display_name=f"{kb_name} - {tenant_id[:8]}",
-                        tenant_id=tenant_id
-                    )
-                    store_id = store_info["store_name"]
-                    
-                elif provider == "internal_rag":
-                    # Internal RAG doesn't need a store - it uses our database
-                    store_id = None
-                else:
-                    logger.warning(f"Unknown provider: {provider}")
-                    continue
-                
-                # Create or update sync record
-                if sync_record:
-                    db.execute(
-                        text("""
-                            UPDATE kb_provider_sync
-                            SET store_id = :store_id,
-                                sync_status = 'enabled',
-                                is_active = TRUE,
-                                updated_at = now()
-                            WHERE id = :id
-                        """),
-                        {"id": sync_record.id, "store_id": store_id}
-                    )
-                else:
-                    sync_id = uuid.uuid4()
-                    db.execute(
-                        text("""
-                            INSERT INTO kb_provider_sync (
-                                id, kb_id, provider, is_active, sync_status, store_id
-                            ) VALUES (
-                                :id, :kb_id, :provider, TRUE, 'enabled', :store_id
-                            )
-                        """),
-                        {
-                            "id": sync_id,
-                            "kb_id": kb_id,
-                            "provider": provider,
-                            "store_id": store_id,
-                        }
-                    )
-                
-                db.commit()
-                store_ids[provider] = store_id
-                logger.info(f"Created store for provider {provider}: {store_id}")
-                
-            except Exception as e:
-                logger.error(f"Error ensuring store for provider {provider}: {e}", exc_info=True)
-                # Update sync record with error
+        # Internal RAG has no remote store and its sync record is written with
+        # the KB itself, so it needs no DB work here
+        if _INTERNAL_PROVIDER in enabled_providers:
+            store_ids[_INTERNAL_PROVIDER] = None
+        remote_requested = [p for p in enabled_providers if p != _INTERNAL_PROVIDER]
+        if not remote_requested:
+            return store_ids
+        
+        # Concurrent calls for the same KB and provider queue up here, so only
+        # the first creates the store; later ones find its committed store_id.
+        # Locks are taken in sorted order so overlapping calls cannot deadlock.
+        async with contextlib.AsyncExitStack() as stack:
+            for provider in sorted(set(remote_requested)):
+                lock = self._ensure_locks.setdefault((kb_id, provider), asyncio.Lock())
+                await stack.enter_async_context(lock)
+            
+            store_ids.update(
+                await self._ensure_remote_stores(tenant_id, kb_id, kb_name, remote_requested, db)
+            )
+        
+        return store_ids
+    
+    async def _ensure_remote_stores(
+        self,
+        tenant_id: str,
+        kb_id: str,
+        kb_name: str,
+        remote_requested: List[str],
+        db: Session
+    ) -> Dict[str, str]:
+        """Look up, create and record remote provider stores (caller holds the locks)."""
+        store_ids = {}
+        sync_records = {}
+        to_create = []
+        
+        # Fetch existing sync records for all requested providers at once
+        existing = {
+            row.provider: row
+            for row in db.execute(
+                _SQL_GET_SYNC_RECORDS,
+                {"kb_id": kb_id, "providers": remote_requested}
+            ).fetchall()
+        }
+        
+        for provider in remote_requested:
+            sync_record = existing.get(provider)
+            
+            if sync_record and sync_record.store_id:
+                # Store already exists
+                store_ids[provider] = sync_record.store_id
+                continue
+            
+            if provider not in _CREATE_FNS:
+                logger.warning(f"Unknown provider: {provider}")
+                continue
+            
+            sync_records[provider] = sync_record
+            to_create.append(provider)
+        
+        # Create missing remote stores concurrently; the SDK calls are blocking,
+        # so each runs in a worker thread
+        display_name = f"{kb_name} - {tenant_id[:8]}"
+        created = await asyncio.gather(
+            *[
+                asyncio.to_thread(self._create_provider_store, provider, display_name, tenant_id)
+                for provider in to_create
+            ],
+            return_exceptions=True,
+        )
+        outcomes = dict(zip(to_create, created))
+        
+        # Collect writes so each kind is a single statement
+        new_rows = []
+        store_updates = []
+        error_updates = []
+        for provider in to_create:
+            sync_record = sync_records[provider]
+            outcome = outcomes[provider]
+            
+            if isinstance(outcome, Exception):
+                logger.error(f"Error ensuring store for provider {provider}: {outcome}", exc_info=outcome)
+                # Record the error on the sync record
                 if sync_record:
-                    db.execute(
-                        text("""
-                            UPDATE kb_provider_sync
-                            SET sync_status = 'error',
-                                error_message = :error_message,
-                                updated_at = now()
-                            WHERE id = :id
-                        """),
-                        {"id": sync_record.id, "error_message": str(e)}
-                    )
+                    error_updates.append((str(sync_record.id), str(outcome)))
                 else:
-                    sync_id = uuid.uuid4()
-                    db.execute(
-                        text("""
-                            INSERT INTO kb_provider_sync (
-                                id, kb_id, provider, is_active, sync_status, error_message
-                            ) VALUES (
-                                :id, :kb_id, :provider, FALSE, 'error', :error_message
-                            )
-                        """),
-                        {
-                            "id": sync_id,
-                            "kb_id": kb_id,
-                            "provider": provider,
-                            "error_message": str(e),
-                        }
-                    )
-                db.commit()
+                    new_rows.append((str(uuid.uuid4()), provider, False, "error", None, str(outcome)))
+                continue
+            
+            if isinstance(outcome, BaseException):
+                raise outcome
+            
+            store_id = outcome
+            
+            # Create or update sync record
+            if sync_record:
+                store_updates.append((str(sync_record.id), store_id))
+            else:
+                new_rows.append((str(uuid.uuid4()), provider, True, "enabled", store_id, None))
+            
+            store_ids[provider] = store_id
+            logger.info(f"Created store for provider {provider}: {store_id}")
+        
+        if new_rows:
+            ids, providers, is_active, sync_statuses, row_store_ids, error_messages = map(list, zip(*new_rows))
+            db.execute(
+                _SQL_INSERT_SYNC_RECORDS,
+                {
+                    "kb_id": kb_id,
+                    "ids": ids,
+                    "providers": providers,
+                    "is_active": is_active,
+                    "sync_statuses": sync_statuses,
+                    "store_ids": row_store_ids,
+                    "error_messages": error_messages,
+                }
+            )
+        if store_updates:
+            ids, update_store_ids = map(list, zip(*store_updates))
+            db.execute(_SQL_UPDATE_SYNC_STORES, {"ids": ids, "store_ids": update_store_ids})
+        if error_updates:
+            ids, error_messages = map(list, zip(*error_updates))
+            db.execute(_SQL_MARK_SYNC_ERRORS_BY_ID, {"ids": ids, "error_messages": error_messages})
+        
+        if to_create:
+            db.commit()
+            self.invalidate_providers_cache(tenant_id, kb_id)
         
         return store_ids
     
+    def _create_provider_store(self, provider: str, display_name: str, tenant_id: str) -> str:
+        """
+        Create the remote store for a provider (blocking SDK call).
+        
+        Returns:
+            store_id / store_name
+        """
+        create_fn, id_key = _CREATE_FNS[provider]
+        store_info = create_fn(display_name, tenant_id)
+        return store_info[id_key]
+    
     async def sync_document_to_providers(
         self,
         tenant_id: str,
         kb_id: str,
         kb_name: str,
         document_id: str,
-        content: str,
+        content: Union[str, bytes],
         title: Optional[str] = None,
-        db: Optional[Session] = None
+        db: Optional[Session] = None,
+        active_providers: Optional[List[Tuple[str, str]]] = None
     ) -> Dict[str, Any]:
         """
         Sync a document to all active providers.
@@ -169,9 +373,11 @@ class KBSyncService:
             kb_id: Knowledge base ID
             kb_name: Knowledge base name
             document_id: Document ID
-            content: Document content
+            content: Document content, as text or already UTF-8 encoded bytes
             title: Document title (optional)
             db: Database session (optional, will create if not provided)
+            active_providers: (provider, store_id) pairs to sync to (optional,
+                looked up from kb_provider_sync if not provided)
         
         Returns:
             Dict with sync results per provider
@@ -179,11 +385,11 @@ class KBSyncService:
         if db is None:
             with get_db_session(tenant_id) as session:
                 return await self._sync_document_impl(
-                    tenant_id, kb_id, kb_name, document_id, content, title, session
+                    tenant_id, kb_id, kb_name, document_id, content, title, session, active_providers
                 )
         else:
             return await self._sync_document_impl(
-                tenant_id, kb_id, kb_name, document_id, content, title, db
+                tenant_id, kb_id, kb_name, document_id, content, title, db, active_providers
             )
     
     async def _sync_document_impl(
@@ -192,108 +398,110 @@ class KBSyncService:
         kb_id: str,
         kb_name: str,
         document_id: str,
-        content: str,
+        content: Union[str, bytes],
         title: Optional[str],
-        db: Session
+        db: Session,
+        active_providers: Optional[List[Tuple[str, str]]] = None
     ) -> Dict[str, Any]:
         """Internal implementation of document sync."""
         results = {}
         
         # Get active providers for this KB
-        active_providers = db.execute(
-            text("""
-                SELECT provider, store_id, sync_status
-                FROM kb_provider_sync
-                WHERE kb_id = :kb_id AND is_active = TRUE AND sync_status = 'enabled'
-            """),
-            {"kb_id": kb_id}
-        ).fetchall()
+        if active_providers is None:
+            targets = self._get_active_providers(tenant_id, kb_id, db)
+        else:
+            targets = active_providers
         
-        for provider_row in active_providers:
-            provider = provider_row.provider
-            store_id = provider_row.store_id
-            
-            if not store_id:
-                continue
-            
-            try:
-                # Convert content to bytes
-                content_bytes = content.encode('utf-8')
-                filename = f"{title or document_id}.txt"
-                
-                if provider == "openai_file":
-                    file_info = await vector_store_service.upload_file_from_content(
-                        vector_store_id=store_id,
-                        content=content_bytes,
-                        filename=filename
-                    )
-                    results[provider] = {
-                        "status": "success",
-                        "file_id": file_info.get("file_id"),
-                    }
-                    
-                elif provider == "gemini_file":
-                    file_info = await file_search_store_service.upload_file_from_content(
-                        store_name=store_id,
-                        content=content_bytes,
-                        filename=filename
-                    )
-                    results[provider] = {
-                        "status": "success",
-                        "file_name": file_info.get("file_name"),
-                    }
-                    
-                elif provider == "internal_rag":
-                    # Internal RAG is already stored in our database
-                    results[provider] = {
-                        "status": "success",
-                        "note": "Already stored in internal_rag database",
-                    }
-                
-                # Update last_sync_at
-                db.execute(
-                    text("""
-                        UPDATE kb_provider_sync
-                        SET last_sync_at = now(),
-                            error_message = NULL,
-                            updated_at = now()
-                        WHERE kb_id = :kb_id AND provider = :provider
-                    """),
-                    {"kb_id": kb_id, "provider": provider}
-                )
-                db.commit()
-                
-            except Exception as e:
-                logger.error(f"Error syncing document to {provider}: {e}", exc_info=True)
+        # Encode once and share the bytes across every provider upload. Bulk
+        # syncs pass bytes already (_sync_one encodes before calling in), so
+        # no text copy is held while the uploads run.
+        content_bytes = content if isinstance(content, bytes) else content.encode('utf-8')
+        filename = f"{title or document_id}.txt"
+        
+        # Upload to all providers concurrently
+        outcomes = await asyncio.gather(
+            *[
+                self._upload_to_provider(provider, store_id, content_bytes, filename)
+                for provider, store_id in targets
+            ],
+            return_exceptions=True,
+        )
+        
+        succeeded = []
+        failed = []
+        for (provider, _), outcome in zip(targets, outcomes):
+            if isinstance(outcome, Exception):
+                # Tracebacks only at DEBUG: this runs per document per provider
+                logger.error("Error syncing document %s to %s: %s", document_id, provider, outcome)
+                logger.debug("Sync failure traceback for document %s", document_id, exc_info=outcome)
                 results[provider] = {
                     "status": "error",
-                    "error": str(e),
+                    "error": str(outcome),
                 }
-                
-                # Update sync record with error
-                db.execute(
-                    text("""
-                        UPDATE kb_provider_sync
-                        SET sync_status = 'error',
-                            error_message = :error_message,
-                            updated_at = now()
-                        WHERE kb_id = :kb_id AND provider = :provider
-                    """),
-                    {
-                        "kb_id": kb_id,
-                        "provider": provider,
-                        "error_message": str(e),
-                    }
-                )
-                db.commit()
+                failed.append((provider, str(outcome)))
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                if outcome is not None:
+                    results[provider] = outcome
+                succeeded.append(provider)
+        
+        # Successful syncs only bump last_sync_at, so they are buffered for the
+        # background flusher; errors are recorded immediately with one UPDATE
+        synced_at = datetime.now(timezone.utc)
+        _pending_sync_marks.extend((tenant_id, kb_id, provider, synced_at) for provider in succeeded)
+        if failed:
+            db.execute(
+                _SQL_MARK_SYNC_ERRORS,
+                {
+                    "kb_id": kb_id,
+                    "providers": [provider for provider, _ in failed],
+                    "error_messages": [error_message for _, error_message in failed],
+                }
+            )
+            db.commit()
+            # Errored providers are no longer 'enabled'
+            self.invalidate_providers_cache(tenant_id, kb_id)
         
         return results
     
+    async def _upload_to_provider(
+        self,
+        provider: str,
+        store_id: str,
+        content_bytes: bytes,
+        filename: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Upload a document to a single provider store.
+        
+        Returns:
+            Per-provider result dict, or None for unknown providers
+        """
+        if provider == _INTERNAL_PROVIDER:
+            # Internal RAG is already stored in our database
+            return {
+                "status": "success",
+                "note": "Already stored in internal_rag database",
+            }
+        
+        entry = _UPLOAD_FNS.get(provider)
+        if entry is None:
+            return None
+        
+        upload_fn, id_key = entry
+        file_info = await upload_fn(store_id, content_bytes, filename)
+        return {
+            "status": "success",
+            id_key: file_info.get(id_key),
+        }
+    
     async def sync_all_documents(
         self,
         tenant_id: str,
         kb_id: str,
-        providers: Optional[List[str]] = None
+        providers: Optional[List[str]] = None,
+        concurrency: int = 8
     ) -> Dict[str, Any]:
         """
         Sync all documents in a knowledge base to specified providers.
@@ -302,6 +510,7 @@ class KBSyncService:
             tenant_id: Tenant ID
             kb_id: Knowledge base ID
             providers: Optional list of providers to sync. If None, syncs all active providers.
+            concurrency: Maximum number of documents synced at the same time
         
         Returns:
             Dict with sync results
@@ -309,11 +518,7 @@ class KBSyncService:
         with get_db_session(tenant_id) as db:
             # Get KB info
             kb = db.execute(
-                text("""
-                    SELECT id, tenant_id, name
-                    FROM knowledge_bases
-                    WHERE id = :kb_id AND tenant_id = :tenant_id
-                """),
+                _SQL_GET_KB,
                 {"kb_id": kb_id, "tenant_id": tenant_id}
             ).fetchone()
             
@@ -322,70 +527,92 @@ class KBSyncService:
             
             kb_name = kb.name
             
-            # Get documents
-            documents = db.execute(
-                text("""
-                    SELECT id, title, content
-                    FROM rag_documents
-                    WHERE tenant_id = :tenant_id
-                      AND kb_name = :kb_name
-                """),
-                {"tenant_id": tenant_id, "kb_name": kb_name}
-            ).fetchall()
-            
             # Get providers to sync
-            if providers:
-                provider_filter = "AND provider = ANY(:providers)"
-                params = {"kb_id": kb_id, "providers": providers}
-            else:
-                provider_filter = ""
-                params = {"kb_id": kb_id}
-            
             active_providers = db.execute(
-                text(f"""
-                    SELECT provider
-                    FROM kb_provider_sync
-                    WHERE kb_id = :kb_id AND is_active = TRUE AND sync_status = 'enabled'
-                    {provider_filter}
-                """),
-                params
+                _SQL_GET_SYNC_TARGETS,
+                {"kb_id": kb_id, "providers": list(providers) if providers else None}
             ).fetchall()
             
-            provider_list = [p.provider for p in active_providers]
+            # Resolved once for the whole run and passed to every document
+            provider_list = [(p.provider, p.store_id) for p in active_providers if p.store_id]
+            
+            # Sync documents concurrently, bounded to respect provider rate limits.
+            # Each document gets its own DB session because a Session must not
+            # be shared between concurrent coroutines. Only ids and titles are
+            # streamed from the cursor; each body is loaded inside its slot, so
+            # at most `concurrency` document bodies are held in memory at once.
+            semaphore = asyncio.Semaphore(concurrency)
+            
+            async def _sync_one(document_id, title):
+                try:
+                    with get_db_session(tenant_id) as doc_db:
+                        content = doc_db.execute(
+                            _SQL_GET_DOCUMENT_CONTENT,
+                            {"document_id": document_id}
+                        ).scalar()
+                        if content is None:
+                            # Deleted after the listing was read
+                            return {}
+                        # Encode now so the text copy is freed before the uploads
+                        # start; only the bytes are held while they run
+                        content = content.encode('utf-8')
+                        return await self.sync_document_to_providers(
+                            tenant_id=tenant_id,
+                            kb_id=kb_id,
+                            kb_name=kb_name,
+                            document_id=document_id,
+                            content=content,
+                            title=title,
+                            db=doc_db,
+                            active_providers=provider_list,
+                        )
+                finally:
+                    semaphore.release()
+            
+            document_ids = []
+            tasks = []
+            documents = db.execute(
+                _SQL_GET_DOCUMENTS,
+                {"tenant_id": tenant_id, "kb_name": kb_name}
+            )
+            try:
+                for doc in documents:
+                    await semaphore.acquire()
+                    document_ids.append(doc.id)
+                    tasks.append(asyncio.create_task(_sync_one(str(doc.id), doc.title)))
+            except BaseException:
+                # Don't leave uploads running if the cursor fails mid-stream
+                for task in tasks:
+                    task.cancel()
+                raise
+            
+            doc_outcomes = await asyncio.gather(*tasks, return_exceptions=True)
             
-            # Sync each document
-            total_docs = len(documents)
+            total_docs = len(document_ids)
             synced_docs = 0
             failed_docs = 0
             results = {}
             
-            for doc in documents:
-                try:
-                    doc_results = await self.sync_document_to_providers(
-                        tenant_id=tenant_id,
-                        kb_id=kb_id,
-                        kb_name=kb_name,
-                        document_id=str(doc.id),
-                        content=doc.content,
-                        title=doc.title,
-                        db=db
-                    )
-                    
-                    # Aggregate results
-                    for provider, result in doc_results.items():
-                        if provider not in results:
-                            results[provider] = {"success": 0, "failed": 0}
-                        
-                        if result.get("status") == "success":
-                            results[provider]["success"] += 1
-                            synced_docs += 1
-                        else:
-                            results[provider]["failed"] += 1
-                            failed_docs += 1
-                            
-                except Exception as e:
-                    logger.error(f"Error syncing document {doc.id}: {e}", exc_info=True)
+            for document_id, doc_results in zip(document_ids, doc_outcomes):
+                if isinstance(doc_results, Exception):
+                    logger.error("Error syncing document %s: %s", document_id, doc_results)
+                    logger.debug("Sync failure traceback for document %s", document_id, exc_info=doc_results)
                     failed_docs += 1
+                    continue
+                if isinstance(doc_results, BaseException):
+                    raise doc_results
+                
+                # Aggregate results
+                for provider, result in doc_results.items():
+                    if provider not in results:
+                        results[provider] = {"success": 0, "failed": 0}
+                    
+                    if result.get("status") == "success":
+                        results[provider]["success"] += 1
+                        synced_docs += 1
+                    else:
+                        results[provider]["failed"] += 1
+                        failed_docs += 1
             
             return {
                 "status": "completed",
@@ -396,6 +623,68 @@ class KBSyncService:
             }
 
 
+async def flush_sync_marks() -> int:
+    """
+    Write all buffered last_sync_at heartbeats, one statement per tenant.
+    
+    The writes run in a worker thread. A tenant's heartbeats are queued again
+    if its write fails, so they are retried on the next flush.
+    
+    Returns:
+        Number of buffered heartbeats drained
+    """
+    # tenant_id -> {(kb_id, provider): latest synced_at}
+    by_tenant: Dict[str, Dict[Tuple[str, str], datetime]] = {}
+    drained = 0
+    while _pending_sync_marks:
+        tenant_id, kb_id, provider, synced_at = _pending_sync_marks.popleft()
+        marks = by_tenant.setdefault(tenant_id, {})
+        key = (kb_id, provider)
+        if key not in marks or marks[key] < synced_at:
+            marks[key] = synced_at
+        drained += 1
+    
+    for tenant_id, marks in by_tenant.items():
+        try:
+            await asyncio.to_thread(_write_sync_marks, tenant_id, marks)
+        except Exception as e:
+            logger.warning(f"Failed to flush {len(marks)} sync heartbeats for tenant {tenant_id}, will retry: {str(e)}")
+            _pending_sync_marks.extend(
+                (tenant_id, kb_id, provider, synced_at)
+                for (kb_id, provider), synced_at in marks.items()
+            )
+    
+    return drained
+
+
+def _write_sync_marks(tenant_id: str, marks: Dict[Tuple[str, str], datetime]) -> None:
+    """Write one tenant's heartbeats (blocking)."""
+    with get_db_session(tenant_id) as db:
+        db.execute(
+            _SQL_MARK_SYNCED,
+            {
+                "kb_ids": [kb_id for kb_id, _ in marks],
+                "providers": [provider for _, provider in marks],
+                "synced_ats": list(marks.values()),
+            }
+        )
+
+
+async def run_sync_mark_flusher(interval_seconds: float = SYNC_MARK_FLUSH_INTERVAL_SECONDS) -> None:
+    """
+    Periodically flush buffered sync heartbeats until cancelled.
+    
+    Remaining heartbeats are flushed on cancellation.
+    """
+    try:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await flush_sync_marks()
+    except asyncio.CancelledError:
+        await flush_sync_marks()
+        raise
+
+
 # Global instance
 kb_sync_service = KBSyncService()
 
@@ -1,23 +1,227 @@
 """Tenant KPI snapshots computation for reporting."""
 
+import asyncio
+import contextlib
+import logging
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional
 from sqlalchemy import text
-from app.infra.database import get_db_session
+from app.infra.config import config
+from app.infra.database import get_db_session, get_admin_db_session
+
+logger = logging.getLogger(__name__)
+
+# Tenants computed together by one grouped query and one snapshot upsert
+KPI_TENANT_BATCH_SIZE = 500
+
+# Version of the metric logic; bump when a metric's definition changes so
+# existing snapshots are recomputed on the next run
+KPI_SNAPSHOT_VERSION = 1
+
+
+# All metrics for a batch of tenants and one period in a single round trip:
+# one CTE per source table, grouped by tenant, left-joined onto the batch so
+# tenants without activity still get a row (NULL aggregates).
+# active_users is reported as DAU for daily and WAU for weekly periods.
+_SQL_TENANT_KPIS = text("""
+    WITH t AS (
+        SELECT UNNEST(CAST(:tenant_ids AS uuid[])) AS tenant_id
+    ),
+    cs AS (
+        SELECT
+            tenant_id,
+            COUNT(*) FILTER (WHERE resolved = TRUE) AS resolved_count,
+            AVG(total_messages) AS avg_messages
+        FROM conversation_stats
+        WHERE tenant_id = ANY(CAST(:tenant_ids AS uuid[]))
+          AND updated_at >= :period_start
+          AND updated_at < :period_end
+        GROUP BY tenant_id
+    ),
+    m AS (
+        SELECT
+            tenant_id,
+            COUNT(DISTINCT conversation_id) AS total_conversations,
+            COUNT(DISTINCT from_external_id) FILTER (WHERE from_type = 'user') AS active_users
+        FROM messages
+        WHERE tenant_id = ANY(CAST(:tenant_ids AS uuid[]))
+          AND created_at >= :period_start
+          AND created_at < :period_end
+        GROUP BY tenant_id
+    ),
+    tc AS (
+        SELECT
+            tenant_id,
+            COUNT(*) AS tool_calls_total,
+            COUNT(*) FILTER (WHERE status = 'success') AS tool_calls_success
+        FROM tool_call_logs
+        WHERE tenant_id = ANY(CAST(:tenant_ids AS uuid[]))
+          AND created_at >= :period_start
+          AND created_at < :period_end
+        GROUP BY tenant_id
+    ),
+    e AS (
+        SELECT
+            tenant_id,
+            COALESCE(SUM(cost), 0) AS total_cost,
+            AVG(latency_ms) FILTER (WHERE event_type = 'llm_call_completed') AS avg_latency
+        FROM event_logs
+        WHERE tenant_id = ANY(CAST(:tenant_ids AS uuid[]))
+          AND event_type IN ('llm_call_completed', 'tool_call_completed')
+          AND created_at >= :period_start
+          AND created_at < :period_end
+        GROUP BY tenant_id
+    )
+    SELECT
+        t.tenant_id,
+        cs.resolved_count, cs.avg_messages,
+        m.total_conversations, m.active_users,
+        tc.tool_calls_total, tc.tool_calls_success,
+        e.total_cost, e.avg_latency
+    FROM t
+    LEFT JOIN cs ON cs.tenant_id = t.tenant_id
+    LEFT JOIN m ON m.tenant_id = t.tenant_id
+    LEFT JOIN tc ON tc.tenant_id = t.tenant_id
+    LEFT JOIN e ON e.tenant_id = t.tenant_id
+""")
+
+# Weekly/monthly variant: additive metrics come from the kpi_daily_rollup
+# materialized view (one row per tenant per day); distinct counts are not
+# additive across days and still come from messages. Same output columns.
+_SQL_TENANT_KPIS_FROM_ROLLUP = text("""
+    WITH t AS (
+        SELECT UNNEST(CAST(:tenant_ids AS uuid[])) AS tenant_id
+    ),
+    r AS (
+        SELECT
+            tenant_id,
+            SUM(resolved_count) AS resolved_count,
+            SUM(total_messages_sum)::numeric / NULLIF(SUM(stats_rows), 0) AS avg_messages,
+            SUM(tool_calls_total) AS tool_calls_total,
+            SUM(tool_calls_success) AS tool_calls_success,
+            SUM(total_cost) AS total_cost,
+            SUM(llm_latency_sum)::numeric / NULLIF(SUM(llm_latency_count), 0) AS avg_latency
+        FROM kpi_daily_rollup
+        WHERE tenant_id = ANY(CAST(:tenant_ids AS uuid[]))
+          AND day >= :period_start
+          AND day < :period_end
+        GROUP BY tenant_id
+    ),
+    m AS (
+        SELECT
+            tenant_id,
+            COUNT(DISTINCT conversation_id) AS total_conversations,
+            COUNT(DISTINCT from_external_id) FILTER (WHERE from_type = 'user') AS active_users
+        FROM messages
+        WHERE tenant_id = ANY(CAST(:tenant_ids AS uuid[]))
+          AND created_at >= :period_start
+          AND created_at < :period_end
+        GROUP BY tenant_id
+    )
+    SELECT
+        t.tenant_id,
+        r.resolved_count, r.avg_messages,
+        m.total_conversations, m.active_users,
+        r.tool_calls_total, r.tool_calls_success,
+        r.total_cost, r.avg_latency
+    FROM t
+    LEFT JOIN r ON r.tenant_id = t.tenant_id
+    LEFT JOIN m ON m.tenant_id = t.tenant_id
+""")
+
+_SQL_REFRESH_DAILY_ROLLUP = text("REFRESH MATERIALIZED VIEW CONCURRENTLY kpi_daily_rollup")
+
+# One statement per tenant batch: rows travel as parallel arrays, so the
+# server parses and plans the upsert once per batch rather than per row
+_SQL_UPSERT_KPI_SNAPSHOTS = text("""
+    INSERT INTO tenant_kpi_snapshots (
+        tenant_id, period_type, period_start, period_end, metric_name, metric_value,
+        snapshot_version
+    )
+    SELECT m.tenant_id, :period_type, :period_start, :period_end, m.metric_name, m.metric_value,
+           :snapshot_version
+    FROM UNNEST(
+        CAST(:tenant_ids AS uuid[]),
+        CAST(:metric_names AS text[]),
+        CAST(:metric_values AS numeric[])
+    ) AS m(tenant_id, metric_name, metric_value)
+    ON CONFLICT (tenant_id, period_type, period_start, metric_name)
+    DO UPDATE SET metric_value = EXCLUDED.metric_value,
+                  snapshot_version = EXCLUDED.snapshot_version,
+                  computed_at = now()
+""")
+
+# Tenants whose snapshot for the period is missing, from older metric logic,
+# computed before the period closed, or older than activity recorded in the
+# period since (late or backfilled events). Runs with RLS off.
+_SQL_TENANTS_NEEDING_KPIS = text("""
+    SELECT t.id
+    FROM tenants t
+    LEFT JOIN LATERAL (
+        SELECT
+            MIN(s.computed_at) AS computed_at,
+            BOOL_AND(s.snapshot_version = :snapshot_version) AS is_current
+        FROM tenant_kpi_snapshots s
+        WHERE s.tenant_id = t.id
+          AND s.period_type = :period_type
+          AND s.period_start = :period_start
+    ) snap ON TRUE
+    WHERE snap.computed_at IS NULL
+       OR NOT snap.is_current
+       OR snap.computed_at < :period_end
+       OR EXISTS (
+            SELECT 1 FROM event_logs e
+            WHERE e.tenant_id = t.id
+              AND e.created_at >= :period_start
+              AND e.created_at < :period_end
+              AND e.created_at > snap.computed_at
+       )
+       OR EXISTS (
+            SELECT 1 FROM messages m
+            WHERE m.tenant_id = t.id
+              AND m.created_at >= :period_start
+              AND m.created_at < :period_end
+              AND m.created_at > snap.computed_at
+       )
+       OR EXISTS (
+            SELECT 1 FROM tool_call_logs tc
+            WHERE tc.tenant_id = t.id
+              AND tc.created_at >= :period_start
+              AND tc.created_at < :period_end
+              AND tc.created_at > snap.computed_at
+       )
+       OR EXISTS (
+            SELECT 1 FROM conversation_stats cs
+            WHERE cs.tenant_id = t.id
+              AND cs.updated_at >= :period_start
+              AND cs.updated_at < :period_end
+              AND cs.updated_at > snap.computed_at
+       )
+""").execution_options(stream_results=True, yield_per=KPI_TENANT_BATCH_SIZE)
+
+_SQL_ALL_TENANTS = text(
+    "SELECT id FROM tenants"
+).execution_options(stream_results=True, yield_per=KPI_TENANT_BATCH_SIZE)
 
 
 async def compute_tenant_kpi_snapshots(
     tenant_id: Optional[str] = None,
     period_type: str = "daily",
     period_start: Optional[datetime] = None,
+    force: bool = False,
 ) -> None:
     """
     Compute and store KPI snapshots for tenants.
     
+    When computing for all tenants, tenants whose snapshot for the period is
+    already up to date are skipped unless force is set. A specific tenant_id
+    is always recomputed.
+    
     Args:
         tenant_id: Optional tenant ID to compute for specific tenant (None = all tenants)
         period_type: 'daily', 'weekly', or 'monthly'
         period_start: Start of period (defaults to yesterday for daily, last week for weekly, last month for monthly)
+        force: Recompute every tenant even if its snapshot is up to date
     """
     if period_start is None:
         if period_type == "daily":
@@ -50,249 +254,228 @@ async def compute_tenant_kpi_snapshots(
     else:
         raise ValueError(f"Invalid period_type: {period_type}")
     
-    # Get list of tenants to process
-    if tenant_id:
-        tenant_ids = [tenant_id]
-    else:
-        # SECURITY: RLS bypass is only allowed for system/admin operations
-        # This function should only be called from:
-        # 1. Scheduled background jobs (cron/worker)
-        # 2. Admin endpoints with proper authorization
-        # 3. Internal system operations
-        # 
-        # NEVER expose this function directly to tenant users via API
-        # 
-        # Get all active tenants
-        with get_db_session(None) as session:  # No tenant context for querying all tenants
-            # SECURITY: Temporarily disable RLS ONLY for this specific query
-            # This is scoped to the transaction and automatically re-enabled
-            # The SET LOCAL ensures it only affects this transaction
-            try:
-                session.execute(text("SET LOCAL row_security = off"))
+    # Compute KPIs in tenant batches (one grouped query and one upsert per
+    # batch); batches run concurrently, bounded by config.KPI_CONCURRENCY
+    semaphore = asyncio.Semaphore(config.KPI_CONCURRENCY)
+    
+    # Only the all-tenants job refreshes (and so may read) the daily rollup;
+    # a single-tenant run scans the raw tables instead of refreshing a view
+    # that holds every tenant's rows
+    use_rollup = tenant_id is None and period_type != "daily"
+    
+    async def _compute_batch(batch: List[str]) -> None:
+        try:
+            await _compute_tenant_kpis(
+                batch,
+                period_type,
+                period_start.date(),
+                period_end.date(),
+                use_rollup=use_rollup,
+            )
+        finally:
+            semaphore.release()
+    
+    batches = []
+    tasks = []
+    with contextlib.ExitStack() as stack:
+        if tenant_id:
+            tenant_batches = [[tenant_id]]
+        else:
+            # SECURITY: RLS bypass is only allowed for system/admin operations
+            # This function should only be called from:
+            # 1. Scheduled background jobs (cron/worker)
+            # 2. Admin endpoints with proper authorization
+            # 3. Internal system operations
+            # 
+            # NEVER expose this function directly to tenant users via API
+            # 
+            # Stream tenant ids from a server-side cursor, one batch at a
+            # time, so memory stays bounded by the batches in flight
+            session = stack.enter_context(get_admin_db_session())
+            if force:
+                tenants = session.execute(_SQL_ALL_TENANTS)
+            else:
                 tenants = session.execute(
-                    text("SELECT id FROM tenants")
-                ).fetchall()
-                tenant_ids = [str(t.id) for t in tenants]
-                # RLS is automatically re-enabled when transaction ends
-                # But we explicitly re-enable it for clarity
-                session.execute(text("SET LOCAL row_security = on"))
-            except Exception as e:
-                # Ensure RLS is re-enabled even on error
-                try:
-                    session.execute(text("SET LOCAL row_security = on"))
-                except:
-                    pass
-                raise
+                    _SQL_TENANTS_NEEDING_KPIS,
+                    {
+                        "period_type": period_type,
+                        "period_start": period_start.date(),
+                        "period_end": period_end.date(),
+                        "snapshot_version": KPI_SNAPSHOT_VERSION,
+                    }
+                )
+            tenant_batches = ([str(t.id) for t in rows] for rows in tenants.partitions())
+        
+        try:
+            for batch in tenant_batches:
+                if not tasks and use_rollup:
+                    # Weekly/monthly KPIs read the daily rollup; bring it up
+                    # to date once for the whole run
+                    await asyncio.to_thread(_refresh_daily_rollup)
+                # Only pull the next batch once a slot is free
+                await semaphore.acquire()
+                batches.append(batch)
+                tasks.append(asyncio.create_task(_compute_batch(batch)))
+        except BaseException:
+            # Don't leave batches running if the cursor fails mid-stream
+            for task in tasks:
+                task.cancel()
+            raise
+    
+    if not tasks:
+        logger.info(f"All {period_type} KPI snapshots for {period_start.date()} are up to date")
+        return
     
-    # Compute KPIs for each tenant
-    for tid in tenant_ids:
-        await _compute_tenant_kpis(
-            tid,
-            period_type,
-            period_start.date(),
-            period_end.date(),
-        )
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    
+    # One batch failing must not stop the others; report failures afterwards
+    failures = []
+    for batch, outcome in zip(batches, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Error computing {period_type} KPIs for {len(batch)} tenant(s) starting at {batch[0]}: {outcome}")
+            failures.append(outcome)
+        elif isinstance(outcome, BaseException):
+            raise outcome
+    
+    if failures:
+        raise failures[0]
 
 
 async def _compute_tenant_kpis(
-    tenant_id: str,
+    tenant_ids: List[str],
     period_type: str,
     period_start: datetime.date,
     period_end: datetime.date,
+    use_rollup: bool = False,
 ) -> None:
-    """Compute KPIs for a single tenant and store in snapshots."""
-    with get_db_session(tenant_id) as session:
-        # 1. Conversations resolved
-        resolved_count = session.execute(
-            text("""
-                SELECT COUNT(*) FROM conversation_stats
-                WHERE tenant_id = :tenant_id
-                  AND resolved = TRUE
-                  AND updated_at >= :period_start
-                  AND updated_at < :period_end
-            """),
-            {
-                "tenant_id": tenant_id,
-                "period_start": period_start,
-                "period_end": period_end,
-            }
-        ).scalar() or 0
-        
-        # 2. Total conversations
-        total_conversations = session.execute(
-            text("""
-                SELECT COUNT(DISTINCT conversation_id) FROM messages
-                WHERE tenant_id = :tenant_id
-                  AND created_at >= :period_start
-                  AND created_at < :period_end
-            """),
-            {
-                "tenant_id": tenant_id,
-                "period_start": period_start,
-                "period_end": period_end,
-            }
-        ).scalar() or 0
-        
-        # 3. Resolution rate
-        resolution_rate = (resolved_count / total_conversations * 100) if total_conversations > 0 else 0.0
-        
-        # 4. Average messages per conversation
-        avg_messages = session.execute(
-            text("""
-                SELECT AVG(total_messages) FROM conversation_stats
-                WHERE tenant_id = :tenant_id
-                  AND updated_at >= :period_start
-                  AND updated_at < :period_end
-            """),
-            {
-                "tenant_id": tenant_id,
-                "period_start": period_start,
-                "period_end": period_end,
-            }
-        ).scalar() or 0.0
-        
-        # 5. Tool call success rate
-        tool_calls_total = session.execute(
-            text("""
-                SELECT COUNT(*) FROM tool_call_logs
-                WHERE tenant_id = :tenant_id
-                  AND created_at >= :period_start
-                  AND created_at < :period_end
-            """),
-            {
-                "tenant_id": tenant_id,
-                "period_start": period_start,
-                "period_end": period_end,
-            }
-        ).scalar() or 0
-        
-        tool_calls_success = session.execute(
-            text("""
-                SELECT COUNT(*) FROM tool_call_logs
-                WHERE tenant_id = :tenant_id
-                  AND status = 'success'
-                  AND created_at >= :period_start
-                  AND created_at < :period_end
-            """),
-            {
-                "tenant_id": tenant_id,
-                "period_start": period_start,
-                "period_end": period_end,
-            }
-        ).scalar() or 0
-        
-        tool_success_rate = (tool_calls_success / tool_calls_total * 100) if tool_calls_total > 0 else 0.0
-        
-        # 6. Average cost per conversation
-        total_cost = session.execute(
-            text("""
-                SELECT COALESCE(SUM(cost), 0) FROM event_logs
-                WHERE tenant_id = :tenant_id
-                  AND event_type IN ('llm_call_completed', 'tool_call_completed')
-                  AND created_at >= :period_start
-                  AND created_at < :period_end
-            """),
+    """Compute KPIs for a batch of tenants and store in snapshots."""
+    # The DB driver is synchronous; run in a worker thread so concurrent
+    # batches overlap their queries and the event loop stays responsive
+    await asyncio.to_thread(
+        _compute_tenant_kpis_sync,
+        tenant_ids,
+        period_type,
+        period_start,
+        period_end,
+        use_rollup,
+    )
+
+
+def _compute_tenant_kpis_sync(
+    tenant_ids: List[str],
+    period_type: str,
+    period_start: datetime.date,
+    period_end: datetime.date,
+    use_rollup: bool = False,
+) -> None:
+    """Blocking implementation of _compute_tenant_kpis."""
+    # A single tenant runs under its own RLS context; a batch spans tenants
+    # and needs the same system-level RLS bypass as the tenant listing
+    if len(tenant_ids) == 1:
+        session_scope = get_db_session(tenant_ids[0])
+    else:
+        session_scope = get_admin_db_session()
+    with session_scope as session:
+        # The rollup is only current when the caller has just refreshed it
+        kpi_sql = _SQL_TENANT_KPIS_FROM_ROLLUP if use_rollup else _SQL_TENANT_KPIS
+        rows = session.execute(
+            kpi_sql,
             {
-                "tenant_id": tenant_id,
+                "tenant_ids": tenant_ids,
                 "period_start": period_start,
                 "period_end": period_end,
             }
-        ).scalar() or 0.0
+        ).fetchall()
         
-        avg_cost_per_conv = (total_cost / total_conversations) if total_conversations > 0 else 0.0
-        
-        # 7. Average latency
-        avg_latency = session.execute(
-            text("""
-                SELECT AVG(latency_ms) FROM event_logs
-                WHERE tenant_id = :tenant_id
-                  AND event_type = 'llm_call_completed'
-                  AND created_at >= :period_start
-                  AND created_at < :period_end
-            """),
-            {
-                "tenant_id": tenant_id,
-                "period_start": period_start,
-                "period_end": period_end,
-            }
-        ).scalar() or 0.0
-        
-        # 8. DAU/WAU (for daily/weekly periods)
-        if period_type == "daily":
-            dau = session.execute(
-                text("""
-                    SELECT COUNT(DISTINCT from_external_id) FROM messages
-                    WHERE tenant_id = :tenant_id
-                      AND from_type = 'user'
-                      AND created_at >= :period_start
-                      AND created_at < :period_end
-                """),
-                {
-                    "tenant_id": tenant_id,
-                    "period_start": period_start,
-                    "period_end": period_end,
-                }
-            ).scalar() or 0
-            
-            _store_kpi_snapshot(session, tenant_id, period_type, period_start, period_end, "dau", float(dau))
-        
-        if period_type == "weekly":
-            wau = session.execute(
-                text("""
-                    SELECT COUNT(DISTINCT from_external_id) FROM messages
-                    WHERE tenant_id = :tenant_id
-                      AND from_type = 'user'
-                      AND created_at >= :period_start
-                      AND created_at < :period_end
-                """),
-                {
-                    "tenant_id": tenant_id,
-                    "period_start": period_start,
-                    "period_end": period_end,
-                }
-            ).scalar() or 0
-            
-            _store_kpi_snapshot(session, tenant_id, period_type, period_start, period_end, "wau", float(wau))
+        metrics_by_tenant = {str(row.tenant_id): _metrics_from_row(row, period_type) for row in rows}
         
         # Store all computed metrics
-        _store_kpi_snapshot(session, tenant_id, period_type, period_start, period_end, "conversations_resolved", float(resolved_count))
-        _store_kpi_snapshot(session, tenant_id, period_type, period_start, period_end, "conversations_total", float(total_conversations))
-        _store_kpi_snapshot(session, tenant_id, period_type, period_start, period_end, "resolution_rate", resolution_rate)
-        _store_kpi_snapshot(session, tenant_id, period_type, period_start, period_end, "avg_messages_per_conv", avg_messages)
-        _store_kpi_snapshot(session, tenant_id, period_type, period_start, period_end, "tool_call_success_rate", tool_success_rate)
-        _store_kpi_snapshot(session, tenant_id, period_type, period_start, period_end, "avg_cost_per_conv", avg_cost_per_conv)
-        _store_kpi_snapshot(session, tenant_id, period_type, period_start, period_end, "avg_latency_ms", avg_latency)
+        _store_kpi_snapshots(session, period_type, period_start, period_end, metrics_by_tenant)
         
         session.commit()
 
 
-def _store_kpi_snapshot(
+def _metrics_from_row(row, period_type: str) -> Dict[str, float]:
+    """Derive a tenant's KPI values from its aggregate row."""
+    # 1. Conversations resolved
+    resolved_count = row.resolved_count or 0
+    
+    # 2. Total conversations
+    total_conversations = row.total_conversations or 0
+    
+    # 3. Resolution rate
+    resolution_rate = (resolved_count / total_conversations * 100) if total_conversations > 0 else 0.0
+    
+    # 4. Average messages per conversation
+    avg_messages = float(row.avg_messages or 0.0)
+    
+    # 5. Tool call success rate
+    tool_calls_total = row.tool_calls_total or 0
+    tool_calls_success = row.tool_calls_success or 0
+    tool_success_rate = (tool_calls_success / tool_calls_total * 100) if tool_calls_total > 0 else 0.0
+    
+    # 6. Average cost per conversation
+    total_cost = float(row.total_cost or 0.0)
+    avg_cost_per_conv = (total_cost / total_conversations) if total_conversations > 0 else 0.0
+    
+    # 7. Average latency
+    avg_latency = float(row.avg_latency or 0.0)
+    
+    metrics = {
+        "conversations_resolved": float(resolved_count),
+        "conversations_total": float(total_conversations),
+        "resolution_rate": resolution_rate,
+        "avg_messages_per_conv": avg_messages,
+        "tool_call_success_rate": tool_success_rate,
+        "avg_cost_per_conv": avg_cost_per_conv,
+        "avg_latency_ms": avg_latency,
+    }
+    
+    # 8. DAU/WAU (for daily/weekly periods)
+    if period_type == "daily":
+        metrics["dau"] = float(row.active_users or 0)
+    
+    if period_type == "weekly":
+        metrics["wau"] = float(row.active_users or 0)
+    
+    return metrics
+
+
+def _refresh_daily_rollup() -> None:
+    """Refresh kpi_daily_rollup without blocking concurrent readers."""
+    with get_db_session(None) as session:
+        session.execute(_SQL_REFRESH_DAILY_ROLLUP)
+
+
+def _store_kpi_snapshots(
     session,
-    tenant_id: str,
     period_type: str,
     period_start: datetime.date,
     period_end: datetime.date,
-    metric_name: str,
-    metric_value: float,
+    metrics_by_tenant: Dict[str, Dict[str, float]],
 ) -> None:
-    """Store a single KPI snapshot (upsert)."""
+    """Store KPI snapshots for many tenants and one period (single multi-row upsert)."""
+    tenant_ids = []
+    metric_names = []
+    metric_values = []
+    for tenant_id, metrics in metrics_by_tenant.items():
+        for metric_name, metric_value in metrics.items():
+            tenant_ids.append(tenant_id)
+            metric_names.append(metric_name)
+            metric_values.append(metric_value)
+    
+    if not tenant_ids:
+        return
+    
     session.execute(
-        text("""
-            INSERT INTO tenant_kpi_snapshots (
-                tenant_id, period_type, period_start, period_end, metric_name, metric_value
-            ) VALUES (
-                :tenant_id, :period_type, :period_start, :period_end, :metric_name, :metric_value
-            )
-            ON CONFLICT (tenant_id, period_type, period_start, metric_name)
-            DO UPDATE SET metric_value = EXCLUDED.metric_value
-        """),
+        _SQL_UPSERT_KPI_SNAPSHOTS,
         {
-            "tenant_id": tenant_id,
             "period_type": period_type,
             "period_start": period_start,
             "period_end": period_end,
-            "metric_name": metric_name,
-            "metric_value": metric_value,
+            "tenant_ids": tenant_ids,
+            "metric_names": metric_names,
+            "metric_values": metric_values,
+            "snapshot_version": KPI_SNAPSHOT_VERSION,
         }
     )
-
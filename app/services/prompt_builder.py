@@ -1,6 +1,7 @@
 """Prompt builder with layered prompt stack."""
 
 import tiktoken
+from functools import lru_cache
 from typing import List
 from app.models.tenant import TenantContext
 from app.models.message import CanonicalMessage
@@ -42,6 +43,56 @@ Guidelines:
 - Maintain a professional and friendly tone"""
 
 
+# Prebuilt layer 1 and 2 messages, shared by every build_messages result.
+# Treat them as read-only: callers must replace, not mutate, these dicts.
+_CORE_GUARDRAILS_MESSAGE = {"role": "system", "content": CORE_GUARDRAILS_PROMPT}
+_GLOBAL_SYSTEM_MESSAGE = {"role": "system", "content": GLOBAL_SYSTEM_PROMPT}
+
+
+# Tokenizer used for history budgeting, loaded on first use
+_ENCODING = None
+
+
+def _get_encoding():
+    """Return the shared cl100k_base encoding."""
+    global _ENCODING
+    if _ENCODING is None:
+        _ENCODING = tiktoken.get_encoding("cl100k_base")
+    return _ENCODING
+
+
+# Token budget for the system layers plus history; history gets whatever the
+# system prompts leave over
+MAX_CONTEXT_TOKENS = 2500
+
+# Token counts of layers 1 and 2; the prompts are immutable, so they are
+# counted once on first use (not at import, as the tokenizer may need to
+# fetch its data)
+_CORE_GUARDRAILS_TOKENS = None
+_GLOBAL_SYSTEM_TOKENS = None
+
+
+def _get_static_prompt_tokens() -> int:
+    """Return the combined token count of the two platform system prompts."""
+    global _CORE_GUARDRAILS_TOKENS, _GLOBAL_SYSTEM_TOKENS
+    if _CORE_GUARDRAILS_TOKENS is None or _GLOBAL_SYSTEM_TOKENS is None:
+        encoding = _get_encoding()
+        _CORE_GUARDRAILS_TOKENS = len(encoding.encode_ordinary(CORE_GUARDRAILS_PROMPT))
+        _GLOBAL_SYSTEM_TOKENS = len(encoding.encode_ordinary(GLOBAL_SYSTEM_PROMPT))
+    return _CORE_GUARDRAILS_TOKENS + _GLOBAL_SYSTEM_TOKENS
+
+
+@lru_cache(maxsize=8192)
+def _count_tokens(text: str) -> int:
+    """
+    Count tokens in a message text.
+    
+    Cached by text, so history messages are tokenized once rather than on
+    every turn. encode_ordinary treats special-token strings as plain text.
+    """
+    return len(_get_encoding().encode_ordinary(text))
+
+
 def build_messages(
     tenant_ctx: TenantContext,
     history: List[CanonicalMessage],
@@ -63,21 +114,12 @@ def build_messages(
         user_message: Current user message
     
     Returns:
-        List of message dicts in format: [{"role": "system"|"user"|"assistant", "content": "..."}]
+        List of message dicts in format: [{"role": "system"|"user"|"assistant", "content": "..."}].
+        The two platform system messages are shared objects and must not be mutated.
     """
-    messages = []
-    
     # Layer 1: Core guardrails (always first)
-    messages.append({
-        "role": "system",
-        "content": CORE_GUARDRAILS_PROMPT
-    })
-    
     # Layer 2: Global system prompt
-    messages.append({
-        "role": "system",
-        "content": GLOBAL_SYSTEM_PROMPT
-    })
+    messages = [_CORE_GUARDRAILS_MESSAGE, _GLOBAL_SYSTEM_MESSAGE]
     
     # Layer 3: Tenant custom prompt (if present and validated)
     tenant_prompt = tenant_ctx.prompt_profile.get("custom_system_prompt")
@@ -88,37 +130,46 @@ def build_messages(
         })
     
     # Layer 4: Conversation history (token-based truncation)
-    # Estimate tokens and truncate to fit within budget
-    # Default budget: ~2000 tokens for history (adjustable)
-    max_history_tokens = 2000
-    
-    # Get appropriate tokenizer based on LLM provider
+    # cl100k_base is used for GPT models and as the estimate for other providers
     try:
-        if tenant_ctx.llm_provider == "openai":
-            # Use cl100k_base for GPT models
-            encoding = tiktoken.get_encoding("cl100k_base")
-        else:
-            # Fallback to cl100k_base for other models
-            encoding = tiktoken.get_encoding("cl100k_base")
+        encoding = _get_encoding()
     except Exception:
         # Fallback to simple message limit if tokenizer fails
         encoding = None
     
     if encoding:
+        # History fills what the system layers leave of the context budget
+        max_history_tokens = MAX_CONTEXT_TOKENS - _get_static_prompt_tokens()
+        if tenant_prompt:
+            max_history_tokens -= _count_tokens(tenant_prompt)
+        max_history_tokens = max(max_history_tokens, 0)
+        
         # Token-based truncation
         selected_history = []
         total_tokens = 0
         
-        # Start from most recent and work backwards
+        # Shortlist the recent messages that could plausibly fit, using a
+        # ~4 chars/token estimate with 25% slack, so older messages that
+        # will be dropped anyway are never tokenized
+        candidates = []
+        estimated_tokens = 0
         for msg in reversed(history):
-            msg_text = msg.content.text
-            msg_tokens = len(encoding.encode(msg_text))
+            candidates.append(msg)
+            estimated_tokens += len(msg.content.text) // 4
+            if estimated_tokens > max_history_tokens * 1.25:
+                break
+        
+        # Exact budgeting over the shortlist, most recent first
+        for msg in candidates:
+            msg_tokens = _count_tokens(msg.content.text)
             
             if total_tokens + msg_tokens > max_history_tokens:
                 break
             
-            selected_history.insert(0, msg)
+            selected_history.append(msg)
             total_tokens += msg_tokens
+        
+        selected_history.reverse()
     else:
         # Fallback: simple message limit
         selected_history = history[-10:]
@@ -51,6 +51,25 @@ FORBIDDEN_PATTERNS = [
     (r"you\s+must\s+ignore\s+the\s+platform\s+rules", "META_OVERRIDE_ATTEMPT", "Attempt to ignore platform rules"),
 ]
 
+# All patterns fused into one alternation so a prompt is scanned in a single
+# pass; group g<i> identifies FORBIDDEN_PATTERNS[i]. Compiled once at import.
+_FUSED_PATTERN = re.compile(
+    "|".join(f"(?P<g{i}>{pattern})" for i, (pattern, _, _) in enumerate(FORBIDDEN_PATTERNS)),
+    re.IGNORECASE,
+)
+_PATTERN_META = {
+    f"g{i}": (i, code, message)
+    for i, (_, code, message) in enumerate(FORBIDDEN_PATTERNS)
+}
+
+# Literal words of which every FORBIDDEN_PATTERNS entry contains at least one.
+# An ASCII prompt containing none of them cannot match, so the regex scan is
+# skipped. Keep in sync when adding patterns.
+_PREFILTER_KEYWORDS = (
+    "ignore", "forget", "disregard", "bound", "disable", "bypass",
+    "reveal", "show", "print", "restrictions", "anymore", "dan",
+)
+
 MAX_PROMPT_LENGTH = 8000
 
 
@@ -83,17 +102,33 @@ def validate_tenant_system_prompt(raw_prompt: str) -> PromptValidationResult:
             issues=issues,
         )
     
+    # Fast path: typical prompts contain none of the keywords. Only for ASCII
+    # text, where lower() agrees with the regex's IGNORECASE matching.
+    if raw_prompt.isascii():
+        lowered = raw_prompt.lower()
+        if not any(keyword in lowered for keyword in _PREFILTER_KEYWORDS):
+            return PromptValidationResult(
+                status=PromptValidationStatus.VALID,
+                sanitized_prompt=raw_prompt,
+                issues=[],
+            )
+    
     # Check for forbidden patterns
-    prompt_lower = raw_prompt.lower()
-    for pattern, code, message in FORBIDDEN_PATTERNS:
-        regex = re.compile(pattern, re.IGNORECASE)
-        for match in regex.finditer(raw_prompt):
-            issues.append(PromptValidationIssue(
-                code=code,
-                message=message,
-                span_start=match.start(),
-                span_end=match.end(),
-            ))
+    found = []
+    for match in _FUSED_PATTERN.finditer(raw_prompt):
+        # The outermost named group closes last, so lastgroup names the pattern
+        index, code, message = _PATTERN_META[match.lastgroup]
+        found.append((index, match.start(), match.end(), code, message))
+    
+    # Report issues grouped by pattern, in FORBIDDEN_PATTERNS order
+    found.sort()
+    for _, span_start, span_end, code, message in found:
+        issues.append(PromptValidationIssue(
+            code=code,
+            message=message,
+            span_start=span_start,
+            span_end=span_end,
+        ))
     
     # v1 policy: Any violation = REJECTED
     if issues:
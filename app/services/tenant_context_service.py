@@ -1,18 +1,118 @@
 """Service to load TenantContext from database."""
 
-from typing import Dict, Any, List
-from sqlalchemy.orm import Session
+import asyncio
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy import text
 
 from app.models.tenant import TenantContext
 from app.infra.database import get_db_session
 
 
+# Contexts are cached per process; writes through the admin endpoints call
+# invalidate_tenant_context, other workers pick changes up within the TTL
+TENANT_CONTEXT_CACHE_TTL_SECONDS = 60
+
+# tenant_id -> (loaded_at, context)
+_context_cache: Dict[str, Tuple[float, TenantContext]] = {}
+
+# Everything a TenantContext needs in one round trip: tenant settings, the
+# prompt profile, and the enabled tools, active KBs and active MCP servers
+# aggregated into arrays on the same row
+_SQL_GET_TENANT_CONTEXT = text("""
+    SELECT
+        t.id, t.llm_provider, t.llm_model, t.isolation_mode,
+        COALESCE(t.max_tool_steps, 10) AS max_tool_steps,
+        COALESCE(t.planning_enabled, TRUE) AS planning_enabled,
+        COALESCE(t.plan_timeout_seconds, 300) AS plan_timeout_seconds,
+        p.tenant_id IS NOT NULL AS has_prompt,
+        p.custom_system_prompt, p.override_mode, p.language_preference, p.tone_profile,
+        ARRAY(
+            SELECT tl.name
+            FROM tenant_tool_policies ttp
+            JOIN tools tl ON ttp.tool_id = tl.id
+            WHERE ttp.tenant_id = t.id AND ttp.is_enabled = TRUE
+        ) AS allowed_tools,
+        COALESCE((
+            SELECT json_agg(json_build_object(
+                'name', kb.name,
+                'provider', kb.provider,
+                'provider_config', kb.provider_config
+            ))
+            FROM knowledge_bases kb
+            WHERE kb.tenant_id = t.id AND kb.is_active = TRUE
+        ), '[]'::json) AS knowledge_bases,
+        COALESCE((
+            SELECT json_agg(json_build_object(
+                'id', ms.id,
+                'name', ms.name,
+                'endpoint', ms.endpoint,
+                'auth_config', ms.auth_config
+            ))
+            FROM mcp_servers ms
+            WHERE ms.tenant_id = t.id AND ms.is_active = TRUE
+        ), '[]'::json) AS mcp_servers
+    FROM tenants t
+    LEFT JOIN LATERAL (
+        SELECT tenant_id, custom_system_prompt, override_mode, language_preference, tone_profile
+        FROM tenant_prompts
+        WHERE tenant_id = t.id
+        LIMIT 1
+    ) p ON TRUE
+    WHERE t.id = :tenant_id
+""")
+
+
 def get_tenant_context(tenant_id: str) -> TenantContext:
     """
-    Load complete TenantContext for a tenant.
+    Get the TenantContext for a tenant.
+    
+    Results are cached per tenant for TENANT_CONTEXT_CACHE_TTL_SECONDS; the
+    returned context is shared and must not be mutated.
+    """
+    tenant_ctx = _get_cached_context(tenant_id)
+    if tenant_ctx is not None:
+        return tenant_ctx
+    
+    tenant_ctx = _load_tenant_context(tenant_id)
+    _context_cache[str(tenant_id)] = (time.monotonic(), tenant_ctx)
+    return tenant_ctx
+
+
+async def get_tenant_context_async(tenant_id: str) -> TenantContext:
+    """
+    Async variant of get_tenant_context for request handlers.
+    
+    On a cache miss the load runs in a worker thread so it never blocks the
+    event loop.
+    """
+    tenant_ctx = _get_cached_context(tenant_id)
+    if tenant_ctx is not None:
+        return tenant_ctx
+    
+    tenant_ctx = await asyncio.to_thread(_load_tenant_context, tenant_id)
+    _context_cache[str(tenant_id)] = (time.monotonic(), tenant_ctx)
+    return tenant_ctx
+
+
+def invalidate_tenant_context(tenant_id: str) -> None:
+    """Drop the cached TenantContext for a tenant."""
+    _context_cache.pop(str(tenant_id), None)
+
+
+def _get_cached_context(tenant_id: str) -> Optional[TenantContext]:
+    """Return the cached context if it is still fresh."""
+    cached = _context_cache.get(str(tenant_id))
+    if cached and time.monotonic() - cached[0] < TENANT_CONTEXT_CACHE_TTL_SECONDS:
+        return cached[1]
+    return None
+
+
+def _load_tenant_context(tenant_id: str) -> TenantContext:
+    """
+    Load complete TenantContext for a tenant from the database.
     
-    Loads:
+    Loads (single query):
     - Tenant base settings (llm_provider, llm_model, isolation_mode)
     - Tenant prompts
     - Tenant tool policies + tools
@@ -20,109 +120,47 @@ def get_tenant_context(tenant_id: str) -> TenantContext:
     - MCP servers
     """
     with get_db_session(tenant_id) as session:
-        # Load tenant base settings
-        tenant_row = session.execute(
-            text("""
-                SELECT id, llm_provider, llm_model, isolation_mode,
-                       COALESCE(max_tool_steps, 10) as max_tool_steps,
-                       COALESCE(planning_enabled, TRUE) as planning_enabled,
-                       COALESCE(plan_timeout_seconds, 300) as plan_timeout_seconds
-                FROM tenants
-                WHERE id = :tenant_id
-            """),
-            {"tenant_id": tenant_id}
-        ).fetchone()
-        
-        if not tenant_row:
-            raise ValueError(f"Tenant {tenant_id} not found")
-        
-        llm_provider = tenant_row.llm_provider
-        llm_model = tenant_row.llm_model
-        isolation_mode = tenant_row.isolation_mode
-        max_tool_steps = tenant_row.max_tool_steps
-        planning_enabled = tenant_row.planning_enabled
-        plan_timeout_seconds = tenant_row.plan_timeout_seconds
-        
-        # Load tenant prompt profile
-        prompt_row = session.execute(
-            text("""
-                SELECT custom_system_prompt, override_mode, language_preference, tone_profile
-                FROM tenant_prompts
-                WHERE tenant_id = :tenant_id
-            """),
-            {"tenant_id": tenant_id}
-        ).fetchone()
-        
-        prompt_profile: Dict[str, Any] = {}
-        if prompt_row:
-            prompt_profile = {
-                "custom_system_prompt": prompt_row.custom_system_prompt,
-                "override_mode": prompt_row.override_mode,
-                "language_preference": prompt_row.language_preference,
-                "tone_profile": prompt_row.tone_profile or {},
-            }
-        
-        # Load allowed tools (from tenant_tool_policies)
-        tool_policies = session.execute(
-            text("""
-                SELECT t.id, t.name, t.description, t.provider, t.parameters_schema, 
-                       t.implementation_ref, ttp.config_override
-                FROM tenant_tool_policies ttp
-                JOIN tools t ON ttp.tool_id = t.id
-                WHERE ttp.tenant_id = :tenant_id AND ttp.is_enabled = TRUE
-            """),
-            {"tenant_id": tenant_id}
-        ).fetchall()
-        
-        allowed_tools: List[str] = [row.name for row in tool_policies]
-        
-        # Load knowledge bases
-        kb_rows = session.execute(
-            text("""
-                SELECT name, provider, provider_config
-                FROM knowledge_bases
-                WHERE tenant_id = :tenant_id AND is_active = TRUE
-            """),
-            {"tenant_id": tenant_id}
-        ).fetchall()
-        
-        kb_configs: Dict[str, Any] = {}
-        for row in kb_rows:
-            kb_configs[row.name] = {
-                "provider": row.provider,
-                "provider_config": row.provider_config,
-            }
-        
-        # Load MCP servers
-        mcp_rows = session.execute(
-            text("""
-                SELECT id, name, endpoint, auth_config
-                FROM mcp_servers
-                WHERE tenant_id = :tenant_id AND is_active = TRUE
-            """),
-            {"tenant_id": tenant_id}
-        ).fetchall()
-        
-        mcp_configs: Dict[str, Any] = {}
-        for row in mcp_rows:
-            mcp_configs[row.name] = {
-                "server_id": str(row.id),
-                "endpoint": row.endpoint,
-                "auth_config": row.auth_config,
-            }
-        
-        return TenantContext(
-            tenant_id=tenant_id,
-            llm_provider=llm_provider,
-            llm_model=llm_model,
-            allowed_tools=allowed_tools,
-            kb_configs=kb_configs,
-            mcp_configs=mcp_configs,
-            prompt_profile=prompt_profile,
-            isolation_mode=isolation_mode,
-            max_tool_steps=max_tool_steps,
-            planning_enabled=planning_enabled,
-            plan_timeout_seconds=plan_timeout_seconds,
-        )
-
-
+        row = session.execute(_SQL_GET_TENANT_CONTEXT, {"tenant_id": tenant_id}).fetchone()
+    
+    if not row:
+        raise ValueError(f"Tenant {tenant_id} not found")
+    
+    prompt_profile: Dict[str, Any] = {}
+    if row.has_prompt:
+        prompt_profile = {
+            "custom_system_prompt": row.custom_system_prompt,
+            "override_mode": row.override_mode,
+            "language_preference": row.language_preference,
+            "tone_profile": row.tone_profile or {},
+        }
+    
+    allowed_tools: List[str] = list(row.allowed_tools or [])
+    
+    kb_configs: Dict[str, Any] = {}
+    for kb in row.knowledge_bases:
+        kb_configs[kb["name"]] = {
+            "provider": kb["provider"],
+            "provider_config": kb["provider_config"],
+        }
+    
+    mcp_configs: Dict[str, Any] = {}
+    for server in row.mcp_servers:
+        mcp_configs[server["name"]] = {
+            "server_id": str(server["id"]),
+            "endpoint": server["endpoint"],
+            "auth_config": server["auth_config"],
+        }
+    
+    return TenantContext(
+        tenant_id=tenant_id,
+        llm_provider=row.llm_provider,
+        llm_model=row.llm_model,
+        allowed_tools=allowed_tools,
+        kb_configs=kb_configs,
+        mcp_configs=mcp_configs,
+        prompt_profile=prompt_profile,
+        isolation_mode=row.isolation_mode,
+        max_tool_steps=row.max_tool_steps,
+        planning_enabled=row.planning_enabled,
+        plan_timeout_seconds=row.plan_timeout_seconds,
+    )
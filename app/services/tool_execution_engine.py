@@ -3,9 +3,12 @@
 import asyncio
 import logging
 import re
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Set, Tuple
+from sqlalchemy import text
 from app.models.tenant import TenantContext
 from app.models.tool import ToolDefinition
+from app.infra.database import get_db_session
+from app.logging.event_logger import log_event
 
 from app.adapters.internal_rag_client import internal_rag_client
 from app.adapters.vendor_adapter_openai import openai_file_client
@@ -15,6 +18,51 @@ from app.services.tool_mapping_service import get_provider_tools_for_abstract, g
 
 logger = logging.getLogger(__name__)
 
+# Search providers: provider -> fn(tenant_ctx, tool_def, args). MCP is not
+# listed because it also takes the execution context (see execute_tool_call).
+# Each returns {"results": [dict, ...], ...}; file_search merging relies on
+# the items being dicts.
+PROVIDER_DISPATCH: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {
+    "internal_rag": internal_rag_client.query,
+    "openai_file": openai_file_client.search,
+    "gemini_file": gemini_file_client.search,
+}
+
+# SQL injection patterns flagged in string tool arguments, fused into one
+# case-insensitive alternation so each value is scanned once
+_SQL_INJECTION_PATTERN = re.compile(
+    r"';?\s*(?:DROP|DELETE|UPDATE|INSERT|ALTER|CREATE|TRUNCATE)"
+    r"|UNION\s+SELECT"
+    r"|OR\s+1\s*=\s*1"
+    r"|--"
+    r"|/\*",
+    re.IGNORECASE,
+)
+
+# Which of the given tool names are enabled for the tenant (one round trip)
+_SQL_GET_ENABLED_TOOL_NAMES = text("""
+    SELECT t.name
+    FROM tenant_tool_policies ttp
+    JOIN tools t ON ttp.tool_id = t.id
+    WHERE ttp.tenant_id = :tenant_id
+      AND t.name = ANY(CAST(:tool_names AS text[]))
+      AND ttp.is_enabled = TRUE
+""")
+
+# Upper bound on a file_search call; providers still running are dropped
+FILE_SEARCH_TIMEOUT_SECONDS = 30.0
+
+def _consume_result(task: asyncio.Task) -> None:
+    """Retrieve a dropped task's outcome so asyncio doesn't log it as unretrieved."""
+    if not task.cancelled():
+        task.exception()
+
+
+def _drop_task(task: asyncio.Task) -> None:
+    """Cancel a provider task whose result is no longer wanted."""
+    task.cancel()
+    task.add_done_callback(_consume_result)
+
 
 def override_user_scoped_parameters(
     tool_def: ToolDefinition,
@@ -36,64 +84,47 @@ def override_user_scoped_parameters(
     if not tool_def.is_user_scoped or not tool_def.user_context_params:
         return llm_args
     
-    overridden_args = llm_args.copy()
+    hits = tool_def.user_context_params & llm_args.keys()
+    if not hits:
+        # Common case: the LLM supplied none of them, nothing to copy
+        return llm_args
+    
+    overridden_args = dict(llm_args)
     overrides_applied = []
     
-    for param_name in tool_def.user_context_params:
-        if param_name in overridden_args:
-            original_value = overridden_args[param_name]
-            # Remove the param - MCP server will resolve from X-User-External-ID header
-            del overridden_args[param_name]
-            overrides_applied.append({
-                "param": param_name,
-                "original_value": str(original_value)[:50],  # Truncate for log
-            })
-    
-        # Log overrides for security audit (detect injection attempts)
-        if overrides_applied:
-            logger.warning(
-                f"Parameter override applied for tool {tool_def.name}: {overrides_applied}. "
-                f"User: {execution_context.get('user_external_id')}, Tenant: {execution_context.get('tenant_id')}"
-            )
-            # Log to security audit (if security event logging exists)
-            # Note: This is best-effort logging, don't block execution if it fails
-            try:
-                from app.logging.event_logger import log_event
-                import asyncio
-                # Create task but don't await (fire and forget for audit logging)
-                try:
-                    loop = asyncio.get_event_loop()
-                    if loop.is_running():
-                        asyncio.create_task(log_event(
-                            tenant_id=execution_context.get("tenant_id"),
-                            event_type="parameter_override",
-                            provider="security",
-                            status="success",
-                            payload={
-                                "tool_name": tool_def.name,
-                                "overrides": overrides_applied,
-                                "user_external_id": execution_context.get("user_external_id"),
-                            },
-                            conversation_id=execution_context.get("conversation_id"),
-                        ))
-                    else:
-                        loop.run_until_complete(log_event(
-                            tenant_id=execution_context.get("tenant_id"),
-                            event_type="parameter_override",
-                            provider="security",
-                            status="success",
-                            payload={
-                                "tool_name": tool_def.name,
-                                "overrides": overrides_applied,
-                                "user_external_id": execution_context.get("user_external_id"),
-                            },
-                            conversation_id=execution_context.get("conversation_id"),
-                        ))
-                except RuntimeError:
-                    # No event loop, skip async logging
-                    pass
-            except Exception:
-                pass  # Don't fail if logging fails
+    for param_name in sorted(hits):
+        # Remove the param - MCP server will resolve from X-User-External-ID header
+        original_value = overridden_args.pop(param_name)
+        overrides_applied.append({
+            "param": param_name,
+            "original_value": str(original_value)[:50],  # Truncate for log
+        })
+    
+    # Log overrides for security audit (detect injection attempts)
+    if overrides_applied:
+        logger.warning(
+            f"Parameter override applied for tool {tool_def.name}: {overrides_applied}. "
+            f"User: {execution_context.get('user_external_id')}, Tenant: {execution_context.get('tenant_id')}"
+        )
+        # Log to security audit, fire and forget (called from the async
+        # tool path; without a running loop the audit record is skipped)
+        # Note: This is best-effort logging, don't block execution if it fails
+        try:
+            asyncio.get_running_loop().create_task(log_event(
+                tenant_id=execution_context.get("tenant_id"),
+                event_type="parameter_override",
+                provider="security",
+                status="success",
+                payload={
+                    "tool_name": tool_def.name,
+                    "overrides": overrides_applied,
+                    "user_external_id": execution_context.get("user_external_id"),
+                },
+                conversation_id=execution_context.get("conversation_id"),
+            ))
+        except RuntimeError:
+            # No running event loop, skip async logging
+            pass
     
     return overridden_args
 
@@ -117,24 +148,14 @@ def validate_tool_arguments_pattern(
     """
     warnings = []
     
-    # Check for SQL injection patterns
-    sql_patterns = [
-        r"';?\s*(DROP|DELETE|UPDATE|INSERT|ALTER|CREATE|TRUNCATE)",
-        r"UNION\s+SELECT",
-        r"OR\s+1\s*=\s*1",
-        r"--",
-        r"/\*",
-    ]
-    
+    # Check for SQL injection patterns (the shortest, "--" and "/*", are
+    # two characters, so shorter values cannot match)
     for param_name, param_value in args.items():
-        if not isinstance(param_value, str):
+        if not isinstance(param_value, str) or len(param_value) < 2:
             continue
         
-        param_lower = param_value.lower()
-        for pattern in sql_patterns:
-            if re.search(pattern, param_lower, re.IGNORECASE):
-                warnings.append(f"Suspicious SQL pattern detected in {param_name}")
-                break
+        if _SQL_INJECTION_PATTERN.search(param_value):
+            warnings.append(f"Suspicious SQL pattern detected in {param_name}")
     
     # Check for cross-user reference attempts (if we have user context)
     user_scoped_params = ["customer_id", "user_id", "account_id", "client_id"]
@@ -151,7 +172,8 @@ async def execute_tool_call(
     tenant_ctx: TenantContext,
     tool_def: ToolDefinition,
     args: Dict[str, Any],
-    execution_context: Optional[Dict[str, Any]] = None,  # NEW: Immutable execution context
+    *,
+    execution_context: Optional[Dict[str, Any]] = None,  # Immutable execution context (keyword-only)
 ) -> Dict[str, Any]:
     """
     Execute a tool call by dispatching to the appropriate provider client.
@@ -193,17 +215,39 @@ async def execute_tool_call(
         return await _execute_multi_provider_search(tenant_ctx, tool_def, args)
     
     # Single provider execution
-    if provider == "internal_rag":
-        return await internal_rag_client.query(tenant_ctx, tool_def, args)
-    elif provider == "openai_file":
-        return await openai_file_client.search(tenant_ctx, tool_def, args)
-    elif provider == "gemini_file":
-        return await gemini_file_client.search(tenant_ctx, tool_def, args)
-    elif provider == "mcp":
+    if provider == "mcp":
         # Pass execution_context to MCP client for header injection
         return await mcp_client.execute(tenant_ctx, tool_def, args, execution_context=execution_context)
-    else:
+    
+    provider_fn = PROVIDER_DISPATCH.get(provider)
+    if provider_fn is None:
         raise ValueError(f"Unknown provider: {provider}")
+    return await provider_fn(tenant_ctx, tool_def, args)
+
+
+def _get_enabled_tool_names(tenant_id: str, tool_names: List[str]) -> Set[str]:
+    """Return the subset of tool_names enabled for the tenant."""
+    with get_db_session(tenant_id) as session:
+        rows = session.execute(
+            _SQL_GET_ENABLED_TOOL_NAMES,
+            {"tenant_id": tenant_id, "tool_names": list(tool_names)}
+        ).fetchall()
+    return {row.name for row in rows}
+
+
+def _prepare_provider_search(
+    tool_def: ToolDefinition,
+    provider_tool_name: str,
+) -> Optional[Tuple[str, Callable[..., Awaitable[Dict[str, Any]]], ToolDefinition]]:
+    """Resolve one provider tool's client and definition, or None if it has no client."""
+    provider = get_provider_from_tool_name(provider_tool_name)
+    provider_fn = PROVIDER_DISPATCH.get(provider)
+    if provider_fn is None:
+        return None
+    
+    # Tool definition for this provider (keeps the file_search name);
+    # model_copy skips re-validating the unchanged fields
+    return provider, provider_fn, tool_def.model_copy(update={"provider": provider})
 
 
 async def _execute_multi_provider_search(
@@ -226,56 +270,34 @@ async def _execute_multi_provider_search(
     provider_tools = get_provider_tools_for_abstract("file_search")
     
     # Verify which provider tools are actually enabled for this tenant
-    from app.infra.database import get_db_session
-    from sqlalchemy import text
-    
-    enabled_provider_tools = []
-    with get_db_session(tenant_ctx.tenant_id) as session:
-        for provider_tool_name in provider_tools:
-            # Check if provider tool is enabled for tenant
-            policy = session.execute(
-                text("""
-                    SELECT ttp.is_enabled
-                    FROM tenant_tool_policies ttp
-                    JOIN tools t ON ttp.tool_id = t.id
-                    WHERE ttp.tenant_id = :tenant_id
-                      AND t.name = :tool_name
-                      AND ttp.is_enabled = TRUE
-                """),
-                {"tenant_id": tenant_ctx.tenant_id, "tool_name": provider_tool_name}
-            ).fetchone()
-            
-            if policy:
-                enabled_provider_tools.append(provider_tool_name)
-    
-    # Create tasks for each enabled provider
+    # (the DB driver is synchronous; keep the query off the event loop)
+    enabled_check = asyncio.create_task(asyncio.to_thread(
+        _get_enabled_tool_names,
+        tenant_ctx.tenant_id,
+        provider_tools,
+    ))
+    
+    # Meanwhile resolve each provider's client and tool definition. This is
+    # local work only: no vendor request is sent until the fresh check has
+    # confirmed the provider is enabled, so a disabled provider is never
+    # queried (or billed) for this tenant
+    prepared = {}
+    for provider_tool_name in provider_tools:
+        provider_search = _prepare_provider_search(tool_def, provider_tool_name)
+        if provider_search is not None:
+            prepared[provider_tool_name] = provider_search
+    
+    enabled_names = await enabled_check
+    
+    # Keep provider order from get_provider_tools_for_abstract
     tasks = []
     provider_names = []
     
-    for provider_tool_name in enabled_provider_tools:
-        provider = get_provider_from_tool_name(provider_tool_name)
-        if not provider:
+    for provider_tool_name in provider_tools:
+        if provider_tool_name not in enabled_names or provider_tool_name not in prepared:
             continue
-        
-        # Create tool definition for this provider
-        provider_tool_def = ToolDefinition(
-            name=tool_def.name,  # Keep file_search name
-            description=tool_def.description,
-            parameters_schema=tool_def.parameters_schema,
-            provider=provider,
-            implementation_ref=tool_def.implementation_ref,
-        )
-        
-        # Create async task
-        if provider == "internal_rag":
-            tasks.append(internal_rag_client.query(tenant_ctx, provider_tool_def, args))
-        elif provider == "openai_file":
-            tasks.append(openai_file_client.search(tenant_ctx, provider_tool_def, args))
-        elif provider == "gemini_file":
-            tasks.append(gemini_file_client.search(tenant_ctx, provider_tool_def, args))
-        else:
-            continue
-        
+        provider, provider_fn, provider_tool_def = prepared[provider_tool_name]
+        tasks.append(asyncio.create_task(provider_fn(tenant_ctx, provider_tool_def, args)))
         provider_names.append(provider)
     
     if not tasks:
@@ -287,35 +309,69 @@ async def _execute_multi_provider_search(
             "errors": [{"error": "No file search providers enabled for this tenant"}],
         }
     
-    # Execute all providers in parallel
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    
-    # Merge results
-    all_results = []
+    # Merge each provider's results as soon as it finishes, so stamping
+    # overlaps the slower providers; any still running at the deadline are
+    # cancelled and reported as errors
+    provider_by_task = dict(zip(tasks, provider_names))
+    merged_by_task: Dict[asyncio.Task, List[Any]] = {}
     errors = []
-    
-    for i, result in enumerate(results):
-        provider = provider_names[i]
-        
-        if isinstance(result, Exception):
-            logger.error(f"Error querying provider {provider}: {result}", exc_info=True)
-            errors.append({"provider": provider, "error": str(result)})
-            continue
-        
-        if isinstance(result, dict) and "results" in result:
-            # Add provider info to each result
-            for item in result.get("results", []):
-                if isinstance(item, dict):
-                    item["_provider"] = provider
-                all_results.append(item)
-        elif isinstance(result, dict):
-            # Single result
-            result["_provider"] = provider
-            all_results.append(result)
-    
-    # Sort by score if available (higher is better)
-    if all_results and any("score" in r for r in all_results if isinstance(r, dict)):
-        all_results.sort(key=lambda x: x.get("score", 0) if isinstance(x, dict) else 0, reverse=True)
+    has_score = False  # whether any merged result carries a score
+    
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + FILE_SEARCH_TIMEOUT_SECONDS
+    pending = set(tasks)
+    try:
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                provider = provider_by_task[task]
+                try:
+                    result = task.result()
+                except Exception as e:
+                    logger.error(f"Error querying provider {provider}: {e}", exc_info=True)
+                    errors.append({"provider": provider, "error": str(e)})
+                    continue
+                
+                if isinstance(result, dict) and "results" in result:
+                    # Add provider info to each result (adapters return dicts)
+                    items = result["results"]
+                    for item in items:
+                        item["_provider"] = provider
+                        if "score" in item:
+                            has_score = True
+                elif isinstance(result, dict):
+                    # Single result
+                    result["_provider"] = provider
+                    if "score" in result:
+                        has_score = True
+                    items = [result]
+                else:
+                    items = []
+                merged_by_task[task] = items
+    finally:
+        for task in pending:
+            _drop_task(task)
+    
+    for task in pending:
+        provider = provider_by_task[task]
+        logger.warning(f"Provider {provider} timed out after {FILE_SEARCH_TIMEOUT_SECONDS}s")
+        errors.append({"provider": provider, "error": f"Timed out after {FILE_SEARCH_TIMEOUT_SECONDS}s"})
+    
+    # Concatenate in provider order so unscored results keep a stable order
+    all_results = []
+    for task in tasks:
+        all_results.extend(merged_by_task.get(task, ()))
+    
+    # Sort by score if available (higher is better). Providers return hits
+    # best-first, so all_results is a few descending runs; the sort detects
+    # and merges those runs rather than sorting from scratch.
+    if has_score:
+        all_results.sort(key=lambda x: x.get("score", 0), reverse=True)
     
     return {
         "results": all_results,
@@ -1,6 +1,7 @@
 """Tool mapping service - maps abstract tools to provider-specific tools."""
 
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from app.infra.config import config
 
 
@@ -13,19 +14,35 @@ ABSTRACT_TO_PROVIDER_TOOLS = {
     }
 }
 
+# Reverse mapping: provider tool name -> provider
+_TOOL_TO_PROVIDER = {
+    tool_name: provider
+    for provider_mapping in ABSTRACT_TO_PROVIDER_TOOLS.values()
+    for provider, tool_name in provider_mapping.items()
+}
+
+# Provider tools hidden from the user-facing API
+_INTERNAL_TOOLS = frozenset({"openai_file_search", "gemini_file_search"})
+
+_ABSTRACT_TOOLS = frozenset(ABSTRACT_TO_PROVIDER_TOOLS)
+
 
-def get_provider_tools_for_abstract(abstract_tool_name: str) -> List[str]:
+@lru_cache(maxsize=16)
+def get_provider_tools_for_abstract(abstract_tool_name: str) -> Tuple[str, ...]:
     """
-    Get list of provider-specific tools for an abstract tool.
+    Get provider-specific tools for an abstract tool.
+    
+    The result depends only on the name and which API keys are configured,
+    so it is cached; call clear_provider_tools_cache if the keys change.
     
     Args:
         abstract_tool_name: Abstract tool name (e.g., "file_search")
     
     Returns:
-        List of provider tool names that should be enabled
+        Tuple of provider tool names that should be enabled
     """
     if abstract_tool_name not in ABSTRACT_TO_PROVIDER_TOOLS:
-        return []
+        return ()
     
     provider_mapping = ABSTRACT_TO_PROVIDER_TOOLS[abstract_tool_name]
     enabled_tools = []
@@ -41,7 +58,12 @@ def get_provider_tools_for_abstract(abstract_tool_name: str) -> List[str]:
     if "internal_rag" in provider_mapping:
         enabled_tools.append(provider_mapping["internal_rag"])
     
-    return enabled_tools
+    return tuple(enabled_tools)
+
+
+def clear_provider_tools_cache() -> None:
+    """Forget cached provider tools (e.g. after API keys are reloaded)."""
+    get_provider_tools_for_abstract.cache_clear()
 
 
 def is_internal_tool(tool_name: str) -> bool:
@@ -54,8 +76,7 @@ def is_internal_tool(tool_name: str) -> bool:
     Returns:
         True if tool is internal-only
     """
-    internal_tools = ["openai_file_search", "gemini_file_search"]
-    return tool_name in internal_tools
+    return tool_name in _INTERNAL_TOOLS
 
 
 def is_abstract_tool(tool_name: str) -> bool:
@@ -68,7 +89,7 @@ def is_abstract_tool(tool_name: str) -> bool:
     Returns:
         True if tool is abstract
     """
-    return tool_name in ABSTRACT_TO_PROVIDER_TOOLS
+    return tool_name in _ABSTRACT_TOOLS
 
 
 def get_provider_from_tool_name(tool_name: str) -> Optional[str]:
@@ -81,13 +102,7 @@ def get_provider_from_tool_name(tool_name: str) -> Optional[str]:
     Returns:
         Provider name (e.g., "openai_file") or None
     """
-    if tool_name == "openai_file_search":
-        return "openai_file"
-    elif tool_name == "gemini_file_search":
-        return "gemini_file"
-    elif tool_name == "internal_rag_search":
-        return "internal_rag"
-    return None
+    return _TOOL_TO_PROVIDER.get(tool_name)
 
 
 def get_provider_tool_name(provider: str) -> Optional[str]:
@@ -1,6 +1,8 @@
 """Tool registry for canonical tools."""
 
-from typing import List
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
@@ -14,41 +16,91 @@ from app.services.tool_mapping_service import (
 )
 
 
+# Tool policies change rarely; cache per process and drop a tenant's entry
+# via invalidate_allowed_tools when its policies are written
+ALLOWED_TOOLS_CACHE_TTL_SECONDS = 60
+
+# tenant_id -> (loaded_at, tools)
+_allowed_tools_cache: Dict[str, Tuple[float, Tuple[ToolDefinition, ...]]] = {}
+
+_SQL_GET_ALLOWED_TOOLS = text("""
+    SELECT t.name, t.description, t.provider,
+           t.parameters_schema, t.implementation_ref, ttp.config_override
+    FROM tenant_tool_policies ttp
+    JOIN tools t ON ttp.tool_id = t.id
+    WHERE ttp.tenant_id = :tenant_id 
+      AND ttp.is_enabled = TRUE
+      AND (t.is_internal IS NULL OR t.is_internal = FALSE)
+""")
+
+
 def get_allowed_tools(tenant_ctx: TenantContext) -> List[ToolDefinition]:
     """
     Get allowed tools for a tenant based on tenant_tool_policies.
     Expands abstract tools (like file_search) to provider-specific tools.
     
     Returns canonical ToolDefinition objects that the tenant is allowed to use.
+    Results are cached per tenant for ALLOWED_TOOLS_CACHE_TTL_SECONDS; each
+    call returns fresh copies, so callers may modify them.
     """
-    with get_db_session(tenant_ctx.tenant_id) as session:
+    tools = _get_cached_tools(tenant_ctx.tenant_id)
+    if tools is None:
+        tools = tuple(_load_allowed_tools(tenant_ctx.tenant_id))
+        _allowed_tools_cache[str(tenant_ctx.tenant_id)] = (time.monotonic(), tools)
+    
+    return [tool.model_copy(deep=True) for tool in tools]
+
+
+async def get_allowed_tools_async(tenant_ctx: TenantContext) -> List[ToolDefinition]:
+    """
+    Async variant of get_allowed_tools.
+    
+    On a cache miss the load runs in a worker thread so it never blocks the
+    event loop.
+    """
+    tools = _get_cached_tools(tenant_ctx.tenant_id)
+    if tools is None:
+        tools = tuple(await asyncio.to_thread(_load_allowed_tools, tenant_ctx.tenant_id))
+        _allowed_tools_cache[str(tenant_ctx.tenant_id)] = (time.monotonic(), tools)
+    
+    return [tool.model_copy(deep=True) for tool in tools]
+
+
+def invalidate_allowed_tools(tenant_id: str) -> None:
+    """Drop the cached allowed tools for a tenant."""
+    _allowed_tools_cache.pop(str(tenant_id), None)
+
+
+def _get_cached_tools(tenant_id: str) -> Optional[Tuple[ToolDefinition, ...]]:
+    """Return the cached tools if they are still fresh."""
+    cached = _allowed_tools_cache.get(str(tenant_id))
+    if cached and time.monotonic() - cached[0] < ALLOWED_TOOLS_CACHE_TTL_SECONDS:
+        return cached[1]
+    return None
+
+
+def _load_allowed_tools(tenant_id: str) -> List[ToolDefinition]:
+    """Load a tenant's allowed tools from the database."""
+    with get_db_session(tenant_id) as session:
         # Load tools from tenant_tool_policies (excluding internal tools)
         tool_rows = session.execute(
-            text("""
-                SELECT t.id, t.name, t.description, t.provider, 
-                       t.parameters_schema, t.implementation_ref, ttp.config_override
-                FROM tenant_tool_policies ttp
-                JOIN tools t ON ttp.tool_id = t.id
-                WHERE ttp.tenant_id = :tenant_id 
-                  AND ttp.is_enabled = TRUE
-                  AND (t.is_internal IS NULL OR t.is_internal = FALSE)
-            """),
-            {"tenant_id": tenant_ctx.tenant_id}
-        ).fetchall()
+            _SQL_GET_ALLOWED_TOOLS,
+            {"tenant_id": tenant_id}
+        ).mappings().all()
         
         tools = []
         for row in tool_rows:
             # For abstract tools, return the abstract tool itself
             # tool_execution_engine will handle multi-provider expansion
-            implementation_ref = row.implementation_ref.copy()
-            if row.config_override:
-                implementation_ref.update(row.config_override)
+            implementation_ref = row["implementation_ref"].copy()
+            if row["config_override"]:
+                implementation_ref.update(row["config_override"])
             
             tool_def = ToolDefinition(
-                name=row.name,
-                description=row.description,
-                parameters_schema=row.parameters_schema,
-                provider=row.provider,  # For abstract tools, this is the base provider (internal_rag)
+                name=row["name"],
+                description=row["description"],
+                parameters_schema=row["parameters_schema"],
+                provider=row["provider"],  # For abstract tools, this is the base provider (internal_rag)
                 implementation_ref=implementation_ref,
             )
             tools.append(tool_def)
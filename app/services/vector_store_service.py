@@ -1,12 +1,34 @@
 """OpenAI vector store service for managing vector stores and files."""
 
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+import mimetypes
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, Any, BinaryIO, Iterator, List, Tuple, Union
+import httpx
 from openai import OpenAI, AsyncOpenAI
 from app.infra.config import config
 
 logger = logging.getLogger(__name__)
 
+# Connection pool for the OpenAI clients; KB syncs upload many documents
+# concurrently, so keep idle connections around to avoid repeated TLS handshakes
+OPENAI_MAX_CONNECTIONS = 100
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 32
+OPENAI_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# Concurrent file uploads per upload_files_batch call (OpenAI rate limits)
+MAX_PARALLEL_UPLOADS = 8
+
+# Files at least this large are streamed to OpenAI in chunks; smaller ones are
+# read whole (without blocking the event loop) by the SDK
+UPLOAD_STREAM_THRESHOLD_BYTES = 8 * 1024 * 1024
+
+# Guards lazy client construction; the sync client is also used from worker threads
+_client_lock = threading.Lock()
+
 
 class VectorStoreService:
     """Service for managing OpenAI vector stores."""
@@ -14,25 +36,62 @@ class VectorStoreService:
     def __init__(self):
         self._client = None
         self._async_client = None
+        self._vector_stores = None
+        self._async_vector_stores = None
     
     @property
     def client(self) -> OpenAI:
         """Synchronous OpenAI client."""
         if self._client is None:
-            if not config.OPENAI_API_KEY:
-                raise ValueError("OPENAI_API_KEY not configured")
-            self._client = OpenAI(api_key=config.OPENAI_API_KEY)
+            with _client_lock:
+                if self._client is None:
+                    if not config.OPENAI_API_KEY:
+                        raise ValueError("OPENAI_API_KEY not configured")
+                    self._client = OpenAI(
+                        api_key=config.OPENAI_API_KEY,
+                        http_client=httpx.Client(timeout=OPENAI_HTTP_TIMEOUT, limits=_http_limits()),
+                    )
         return self._client
     
     @property
     def async_client(self) -> AsyncOpenAI:
         """Asynchronous OpenAI client."""
         if self._async_client is None:
-            if not config.OPENAI_API_KEY:
-                raise ValueError("OPENAI_API_KEY not configured")
-            self._async_client = AsyncOpenAI(api_key=config.OPENAI_API_KEY)
+            with _client_lock:
+                if self._async_client is None:
+                    if not config.OPENAI_API_KEY:
+                        raise ValueError("OPENAI_API_KEY not configured")
+                    self._async_client = AsyncOpenAI(
+                        api_key=config.OPENAI_API_KEY,
+                        http_client=httpx.AsyncClient(timeout=OPENAI_HTTP_TIMEOUT, limits=_http_limits()),
+                    )
         return self._async_client
     
+    @property
+    def vector_stores(self):
+        """Vector stores resource of the synchronous client (resolved once)."""
+        if self._vector_stores is None:
+            self._vector_stores = _resolve_vector_stores(self.client)
+        return self._vector_stores
+    
+    @property
+    def async_vector_stores(self):
+        """Vector stores resource of the asynchronous client (resolved once)."""
+        if self._async_vector_stores is None:
+            self._async_vector_stores = _resolve_vector_stores(self.async_client)
+        return self._async_vector_stores
+    
+    async def aclose(self) -> None:
+        """Close the clients' connection pools (called on application shutdown)."""
+        with _client_lock:
+            client, self._client = self._client, None
+            async_client, self._async_client = self._async_client, None
+            self._vector_stores = self._async_vector_stores = None
+        if client is not None:
+            client.close()
+        if async_client is not None:
+            await async_client.close()
+    
     def create_vector_store(self, name: str, tenant_id: str) -> Dict[str, Any]:
         """
         Create a new vector store.
@@ -45,21 +104,10 @@ class VectorStoreService:
             Dict with vector_store_id and other metadata
         """
         try:
-            client = self.client
-            
-            # Try different API paths
-            if hasattr(client.beta, 'vector_stores'):
-                vector_store = client.beta.vector_stores.create(
-                    name=name,
-                    metadata={"tenant_id": tenant_id}
-                )
-            elif hasattr(client.beta, 'assistants') and hasattr(client.beta.assistants, 'vector_stores'):
-                vector_store = client.beta.assistants.vector_stores.create(
-                    name=name,
-                    metadata={"tenant_id": tenant_id}
-                )
-            else:
-                raise ValueError("Vector stores API not available")
+            vector_store = self.vector_stores.create(
+                name=name,
+                metadata={"tenant_id": tenant_id}
+            )
             
             return {
                 "vector_store_id": vector_store.id,
@@ -81,14 +129,7 @@ class VectorStoreService:
             Dict with vector store details or None if not found
         """
         try:
-            client = self.client
-            
-            if hasattr(client.beta, 'vector_stores'):
-                vector_store = client.beta.vector_stores.retrieve(vector_store_id)
-            elif hasattr(client.beta, 'assistants') and hasattr(client.beta.assistants, 'vector_stores'):
-                vector_store = client.beta.assistants.vector_stores.retrieve(vector_store_id)
-            else:
-                return None
+            vector_store = self.vector_stores.retrieve(vector_store_id)
             
             return {
                 "vector_store_id": vector_store.id,
@@ -112,7 +153,6 @@ class VectorStoreService:
             True if successful
         """
         try:
-            client = self.client
             update_params = {}
             if name:
                 update_params["name"] = name
@@ -120,13 +160,7 @@ class VectorStoreService:
             if not update_params:
                 return True
             
-            if hasattr(client.beta, 'vector_stores'):
-                client.beta.vector_stores.update(vector_store_id, **update_params)
-            elif hasattr(client.beta, 'assistants') and hasattr(client.beta.assistants, 'vector_stores'):
-                client.beta.assistants.vector_stores.update(vector_store_id, **update_params)
-            else:
-                return False
-            
+            self.vector_stores.update(vector_store_id, **update_params)
             return True
         except Exception as e:
             logger.error(f"Error updating vector store {vector_store_id}: {e}", exc_info=True)
@@ -143,15 +177,7 @@ class VectorStoreService:
             True if successful
         """
         try:
-            client = self.client
-            
-            if hasattr(client.beta, 'vector_stores'):
-                client.beta.vector_stores.delete(vector_store_id)
-            elif hasattr(client.beta, 'assistants') and hasattr(client.beta.assistants, 'vector_stores'):
-                client.beta.assistants.vector_stores.delete(vector_store_id)
-            else:
-                return False
-            
+            self.vector_stores.delete(vector_store_id)
             return True
         except Exception as e:
             logger.error(f"Error deleting vector store {vector_store_id}: {e}", exc_info=True)
@@ -169,43 +195,15 @@ class VectorStoreService:
         Returns:
             Dict with file_id and other metadata
         """
-        try:
-            client = self.async_client
-            
-            # First, upload the file
-            with open(file_path, "rb") as f:
-                file = await client.files.create(
-                    file=f,
-                    purpose="assistants"
-                )
-            
-            # Then add file to vector store
-            if hasattr(client.beta, 'vector_stores'):
-                await client.beta.vector_stores.files.create(
-                    vector_store_id=vector_store_id,
-                    file_id=file.id
-                )
-            elif hasattr(client.beta, 'assistants') and hasattr(client.beta.assistants, 'vector_stores'):
-                await client.beta.assistants.vector_stores.files.create(
-                    vector_store_id=vector_store_id,
-                    file_id=file.id
-                )
-            else:
-                raise ValueError("Vector stores API not available")
-            
-            return {
-                "file_id": file.id,
-                "filename": getattr(file, 'filename', display_name),
-                "bytes": getattr(file, 'bytes', None),
-            }
-        except Exception as e:
-            logger.error(f"Error uploading file to vector store {vector_store_id}: {e}", exc_info=True)
-            raise
+        with _upload_source(file_path) as file:
+            return await self._upload(vector_store_id, file, display_name or file_path)
     
     async def upload_file_from_content(self, vector_store_id: str, content: bytes, filename: str) -> Dict[str, Any]:
         """
         Upload file content to vector store.
         
+        The content is sent from memory; nothing is written to disk.
+        
         Args:
             vector_store_id: Vector store ID
             content: File content as bytes
@@ -214,18 +212,93 @@ class VectorStoreService:
         Returns:
             Dict with file_id and other metadata
         """
-        import tempfile
-        import os
+        mime_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        return await self._upload(vector_store_id, (filename, content, mime_type), filename)
+    
+    async def upload_files_batch(self, vector_store_id: str, file_paths: List[str]) -> Dict[str, Any]:
+        """
+        Upload several files and attach them to a vector store in one batch.
+        
+        Files are uploaded concurrently (at most MAX_PARALLEL_UPLOADS at a
+        time), then attached with a single file batch call instead of one
+        attach request per file.
+        
+        Args:
+            vector_store_id: Vector store ID
+            file_paths: Paths to files to upload
+        
+        Returns:
+            Dict with batch_id, file_ids and batch status
+        """
+        if not file_paths:
+            return {"batch_id": None, "file_ids": [], "status": None}
+        
+        client = self.async_client
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_UPLOADS)
+        
+        async def _upload_one(file_path: str) -> str:
+            async with semaphore:
+                with _upload_source(file_path) as source:
+                    file = await client.files.create(file=source, purpose="assistants")
+            return file.id
+        
+        try:
+            file_ids = list(await asyncio.gather(*[_upload_one(path) for path in file_paths]))
+            batch = await self.async_vector_stores.file_batches.create(
+                vector_store_id=vector_store_id,
+                file_ids=file_ids
+            )
+            
+            return {
+                "batch_id": batch.id,
+                "file_ids": file_ids,
+                "status": getattr(batch, 'status', None),
+            }
+        except Exception as e:
+            logger.error(f"Error batch uploading {len(file_paths)} files to vector store {vector_store_id}: {e}", exc_info=True)
+            raise
+    
+    async def _upload(self, vector_store_id: str, file: Union[Path, BinaryIO, Tuple[str, bytes, str]], display_name: str) -> Dict[str, Any]:
+        """
+        Upload a file path or (filename, content, mime type) tuple and attach it.
         
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as tmp_file:
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
+        Args:
+            vector_store_id: Vector store ID
+            file: Path to file, open binary file, or (filename, content, mime type)
+            display_name: Name used in the result and in error logs
         
+        Returns:
+            Dict with file_id and other metadata
+        """
         try:
-            return await self.upload_file(vector_store_id, tmp_path, filename)
-        finally:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+            client = self.async_client
+            
+            # First, upload the file
+            file = await client.files.create(
+                file=file,
+                purpose="assistants"
+            )
+            
+            # Then add file to vector store
+            await self._attach_file_id(vector_store_id, file.id)
+            
+            return {
+                "file_id": file.id,
+                "filename": getattr(file, 'filename', display_name),
+                "bytes": getattr(file, 'bytes', None),
+            }
+        except Exception as e:
+            # Callers log upload failures per document; keep the traceback at DEBUG
+            logger.error("Error uploading %s to vector store %s: %s", display_name, vector_store_id, e)
+            logger.debug("Upload failure traceback", exc_info=True)
+            raise
+    
+    async def _attach_file_id(self, vector_store_id: str, file_id: str) -> None:
+        """Add an uploaded file to a vector store."""
+        await self.async_vector_stores.files.create(
+            vector_store_id=vector_store_id,
+            file_id=file_id
+        )
     
     async def list_files(self, vector_store_id: str, limit: int = 100) -> List[Dict[str, Any]]:
         """
@@ -239,20 +312,10 @@ class VectorStoreService:
             List of file dicts
         """
         try:
-            client = self.async_client
-            
-            if hasattr(client.beta, 'vector_stores'):
-                files = await client.beta.vector_stores.files.list(
-                    vector_store_id=vector_store_id,
-                    limit=limit
-                )
-            elif hasattr(client.beta, 'assistants') and hasattr(client.beta.assistants, 'vector_stores'):
-                files = await client.beta.assistants.vector_stores.files.list(
-                    vector_store_id=vector_store_id,
-                    limit=limit
-                )
-            else:
-                return []
+            files = await self.async_vector_stores.files.list(
+                vector_store_id=vector_store_id,
+                limit=limit
+            )
             
             return [
                 {
@@ -266,6 +329,30 @@ class VectorStoreService:
             logger.error(f"Error listing files in vector store {vector_store_id}: {e}", exc_info=True)
             return []
     
+    async def get_file_status(self, vector_store_id: str, file_id: str) -> Optional[str]:
+        """
+        Get the processing status of one file in vector store.
+        
+        A single-object lookup; use it instead of list_files when polling
+        whether a specific file is ready.
+        
+        Args:
+            vector_store_id: Vector store ID
+            file_id: File ID
+        
+        Returns:
+            Status (e.g. "in_progress", "completed", "failed") or None if not found
+        """
+        try:
+            file = await self.async_vector_stores.files.retrieve(
+                vector_store_id=vector_store_id,
+                file_id=file_id
+            )
+            return getattr(file, 'status', None)
+        except Exception as e:
+            logger.error(f"Error getting status of file {file_id} in vector store {vector_store_id}: {e}", exc_info=True)
+            return None
+    
     async def delete_file(self, vector_store_id: str, file_id: str) -> bool:
         """
         Delete a file from vector store.
@@ -278,27 +365,57 @@ class VectorStoreService:
             True if successful
         """
         try:
-            client = self.async_client
-            
-            if hasattr(client.beta, 'vector_stores'):
-                await client.beta.vector_stores.files.delete(
-                    vector_store_id=vector_store_id,
-                    file_id=file_id
-                )
-            elif hasattr(client.beta, 'assistants') and hasattr(client.beta.assistants, 'vector_stores'):
-                await client.beta.assistants.vector_stores.files.delete(
-                    vector_store_id=vector_store_id,
-                    file_id=file_id
-                )
-            else:
-                return False
-            
+            await self.async_vector_stores.files.delete(
+                vector_store_id=vector_store_id,
+                file_id=file_id
+            )
             return True
         except Exception as e:
             logger.error(f"Error deleting file {file_id} from vector store {vector_store_id}: {e}", exc_info=True)
             return False
 
 
+@contextmanager
+def _upload_source(file_path: str) -> Iterator[Union[Path, BinaryIO]]:
+    """
+    Yield what to pass to files.create for a file on disk.
+    
+    The SDK reads a Path into memory in one go; an open file is streamed by
+    httpx in chunks, so large files are passed as open handles to keep
+    memory bounded.
+    """
+    path = Path(file_path)
+    if path.stat().st_size < UPLOAD_STREAM_THRESHOLD_BYTES:
+        yield path
+    else:
+        with open(path, "rb") as f:
+            yield f
+
+
+def _resolve_vector_stores(client):
+    """
+    Find the vector stores resource on an OpenAI client.
+    
+    It moved from client.beta (and, earlier, client.beta.assistants) to the
+    top level across SDK versions.
+    """
+    if hasattr(client, 'vector_stores'):
+        return client.vector_stores
+    if hasattr(client.beta, 'vector_stores'):
+        return client.beta.vector_stores
+    if hasattr(client.beta, 'assistants') and hasattr(client.beta.assistants, 'vector_stores'):
+        return client.beta.assistants.vector_stores
+    raise ValueError("Vector stores API not available")
+
+
+def _http_limits() -> httpx.Limits:
+    """Connection pool limits shared by the sync and async clients."""
+    return httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    )
+
+
 # Global instance
 vector_store_service = VectorStoreService()
 
@@ -2,16 +2,23 @@
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, List, Optional
 from app.models.tenant import TenantContext
 from app.services.tool_execution_engine import execute_tool_call
-from app.services.tool_registry import get_allowed_tools
+from app.services.tool_registry import get_allowed_tools_async
 from app.services.agentic_decider import make_decision
 
 logger = logging.getLogger(__name__)
 
 MAX_PARALLEL_TOOLS = 5
 
+# Condition step operators: type -> fn(context, field, value)
+_CONDITION_OPS: Dict[str, Callable[[Dict[str, Any], Any, Any], bool]] = {
+    "equals": lambda context, field, value: context.get(field) == value,
+    "not_equals": lambda context, field, value: context.get(field) != value,
+    "exists": lambda context, field, value: field in context,
+}
+
 
 async def execute_workflow(
     tenant_ctx: TenantContext,
@@ -24,7 +31,9 @@ async def execute_workflow(
     Args:
         tenant_ctx: TenantContext
         workflow_def: Workflow definition with:
-            - steps: List of workflow steps
+            - steps: List of workflow steps. A tool step may declare
+              depends_on (list of step names); consecutive tool steps that
+              do not depend on each other run concurrently.
             - conditions: Optional conditional branching logic
         initial_context: Optional initial context
     
@@ -33,14 +42,20 @@ async def execute_workflow(
     """
     context = initial_context or {}
     results = []
+    has_failure = False
     step_results = {}
     
     steps = workflow_def.get("steps", [])
     if not steps:
         raise ValueError("Workflow must have at least one step")
     
+    # Branch targets by step name (first occurrence wins, like a linear scan)
+    step_index: Dict[str, int] = {}
+    for idx, s in enumerate(steps):
+        step_index.setdefault(s.get("name"), idx)
+    
     # Get available tools
-    tools = get_allowed_tools(tenant_ctx)
+    tools = await get_allowed_tools_async(tenant_ctx)
     tool_map = {t.name: t for t in tools}
     
     i = 0
@@ -51,26 +66,50 @@ async def execute_workflow(
         
         try:
             if step_type == "tool":
-                # Execute tool step
-                tool_name = step.get("tool_name")
-                tool_args = step.get("tool_args", {})
-                
-                if tool_name not in tool_map:
-                    raise ValueError(f"Tool {tool_name} not available")
+                # Execute this tool step together with any following tool
+                # steps that declare they do not depend on it
+                end = _independent_tool_run(steps, i)
+                batch = steps[i:end]
+                outcomes = await asyncio.gather(
+                    *[_execute_tool_step(tenant_ctx, tool_map, b_step) for b_step in batch],
+                    return_exceptions=True,
+                )
                 
-                tool_def = tool_map[tool_name]
-                result = await execute_tool_call(tenant_ctx, tool_def, tool_args)
-                
-                step_results[step_name] = result
-                results.append({
-                    "step": step_name,
-                    "type": "tool",
-                    "status": "success",
-                    "result": result,
-                })
+                stop = False
+                for offset, (b_step, outcome) in enumerate(zip(batch, outcomes)):
+                    b_step_name = b_step.get("name", f"step_{i + offset}")
+                    if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+                        # Cancellation and interpreter exits propagate rather
+                        # than being recorded as a step result
+                        raise outcome
+                    if isinstance(outcome, Exception):
+                        logger.error(f"Workflow step {b_step_name} failed: {str(outcome)}", exc_info=outcome)
+                        results.append({
+                            "step": b_step_name,
+                            "type": "tool",
+                            "status": "failure",
+                            "error": str(outcome),
+                        })
+                        has_failure = True
+                        if not b_step.get("continue_on_error", False):
+                            stop = True
+                        continue
+                    
+                    step_results[b_step_name] = outcome
+                    results.append({
+                        "step": b_step_name,
+                        "type": "tool",
+                        "status": "success",
+                        "result": outcome,
+                    })
+                    
+                    # Update context with result
+                    context[b_step_name] = outcome
                 
-                # Update context with result
-                context[step_name] = result
+                if stop:
+                    break
+                i = end
+                continue
             
             elif step_type == "condition":
                 # Conditional branching
@@ -79,33 +118,19 @@ async def execute_workflow(
                 field = condition.get("field")
                 value = condition.get("value")
                 
-                # Evaluate condition
-                condition_met = False
-                if condition_type == "equals":
-                    condition_met = context.get(field) == value
-                elif condition_type == "not_equals":
-                    condition_met = context.get(field) != value
-                elif condition_type == "exists":
-                    condition_met = field in context
+                # Evaluate condition (unknown types are never met)
+                condition_op = _CONDITION_OPS.get(condition_type)
+                condition_met = condition_op(context, field, value) if condition_op else False
                 
                 # Branch based on condition
                 if condition_met:
                     # Go to true branch
                     next_step = step.get("true_step")
-                    if next_step:
-                        # Find step index by name
-                        for idx, s in enumerate(steps):
-                            if s.get("name") == next_step:
-                                i = idx - 1  # Will be incremented
-                                break
                 else:
                     # Go to false branch
                     next_step = step.get("false_step")
-                    if next_step:
-                        for idx, s in enumerate(steps):
-                            if s.get("name") == next_step:
-                                i = idx - 1
-                                break
+                if next_step and next_step in step_index:
+                    i = step_index[next_step] - 1  # Will be incremented
                 
                 results.append({
                     "step": step_name,
@@ -115,26 +140,26 @@ async def execute_workflow(
                 })
             
             elif step_type == "parallel":
-                # Parallel execution
+                # Parallel execution, at most MAX_PARALLEL_TOOLS at a time
                 parallel_steps = step.get("steps", [])
-                if len(parallel_steps) > MAX_PARALLEL_TOOLS:
-                    parallel_steps = parallel_steps[:MAX_PARALLEL_TOOLS]
+                semaphore = asyncio.Semaphore(MAX_PARALLEL_TOOLS)
                 
-                # Execute steps in parallel
-                tasks = []
-                for p_step in parallel_steps:
-                    p_tool_name = p_step.get("tool_name")
-                    p_tool_args = p_step.get("tool_args", {})
-                    
-                    if p_tool_name in tool_map:
-                        p_tool_def = tool_map[p_tool_name]
-                        tasks.append(execute_tool_call(tenant_ctx, p_tool_def, p_tool_args))
+                async def _run_bounded(p_step: Dict[str, Any]) -> Dict[str, Any]:
+                    async with semaphore:
+                        return await _execute_tool_step(tenant_ctx, tool_map, p_step)
                 
-                if tasks:
-                    parallel_results = await asyncio.gather(*tasks, return_exceptions=True)
+                if parallel_steps:
+                    parallel_results = await asyncio.gather(
+                        *[_run_bounded(p_step) for p_step in parallel_steps],
+                        return_exceptions=True,
+                    )
                     
                     for idx, result in enumerate(parallel_results):
                         p_step_name = parallel_steps[idx].get("name", f"parallel_{idx}")
+                        if isinstance(result, BaseException) and not isinstance(result, Exception):
+                            # Cancellation and interpreter exits propagate rather
+                            # than being recorded as a step result
+                            raise result
                         if isinstance(result, Exception):
                             step_results[p_step_name] = {"error": str(result)}
                             results.append({
@@ -143,6 +168,7 @@ async def execute_workflow(
                                 "status": "failure",
                                 "error": str(result),
                             })
+                            has_failure = True
                         else:
                             step_results[p_step_name] = result
                             context[p_step_name] = result
@@ -179,6 +205,7 @@ async def execute_workflow(
                 "status": "failure",
                 "error": str(e),
             })
+            has_failure = True
             
             # Check if workflow should continue on error
             if not step.get("continue_on_error", False):
@@ -187,9 +214,43 @@ async def execute_workflow(
             i += 1
     
     return {
-        "status": "completed" if all(r.get("status") == "success" for r in results) else "partial",
+        "status": "partial" if has_failure else "completed",
         "results": results,
         "step_results": step_results,
         "final_context": context,
     }
 
+
+def _independent_tool_run(steps: List[Dict[str, Any]], start: int) -> int:
+    """
+    Return the end index of the tool steps from start that can run concurrently.
+    
+    A following tool step joins the run only if it declares depends_on and
+    none of its dependencies is in the run. Steps without depends_on depend
+    on the step before them, so they keep running one at a time.
+    """
+    names = {steps[start].get("name", f"step_{start}")}
+    end = start + 1
+    while end < len(steps) and end - start < MAX_PARALLEL_TOOLS:
+        step = steps[end]
+        depends_on = step.get("depends_on")
+        if step.get("type", "tool") != "tool" or depends_on is None or names.intersection(depends_on):
+            break
+        names.add(step.get("name", f"step_{end}"))
+        end += 1
+    return end
+
+
+async def _execute_tool_step(
+    tenant_ctx: TenantContext,
+    tool_map: Dict[str, Any],
+    step: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Execute a single tool step."""
+    tool_name = step.get("tool_name")
+    tool_args = step.get("tool_args", {})
+    
+    if tool_name not in tool_map:
+        raise ValueError(f"Tool {tool_name} not available")
+    
+    return await execute_tool_call(tenant_ctx, tool_map[tool_name], tool_args)
@@ -1,10 +1,25 @@
 """Worker function for processing messages from queue."""
 
 import asyncio
-from typing import Dict, Any
+import atexit
+from typing import Dict, Any, Optional
 from app.models.message import CanonicalMessage
 from app.main import handle_inbound_message_sync
 
+# Event loop shared by every job this process runs, so async clients keep
+# their pooled connections between messages. (A forking RQ worker runs each
+# job in a fresh work horse and so still gets one loop per job.)
+_runner: Optional[asyncio.Runner] = None
+
+
+def _get_runner() -> asyncio.Runner:
+    """Return the process-wide runner, creating it on first use."""
+    global _runner
+    if _runner is None:
+        _runner = asyncio.Runner()
+        atexit.register(_runner.close)
+    return _runner
+
 
 def process_inbound_message(message_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -19,33 +34,20 @@ def process_inbound_message(message_data: Dict[str, Any]) -> Dict[str, Any]:
         Result dict with status and response
     """
     # Convert dict to CanonicalMessage
-    message = CanonicalMessage(**message_data)
+    message = CanonicalMessage.model_validate(message_data)
+    
+    # Import here to avoid circular imports
+    from app.infra.database import SessionLocal
     
-    # Run async handler in event loop
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    # Session from the shared pool; closing it returns the connection
+    db = SessionLocal()
     
     try:
-        # Import here to avoid circular imports
-        from app.infra.database import get_db
-        from sqlalchemy.orm import Session
-        
-        # Create a DB session for this worker
-        db_gen = get_db()
-        db = next(db_gen)
-        
-        try:
-            result = loop.run_until_complete(
-                handle_inbound_message_sync(message, db)
-            )
-            return result
-        finally:
-            db.close()
-            try:
-                next(db_gen, None)  # Clean up generator
-            except:
-                pass
+        # Run async handler on the process-wide event loop
+        return _get_runner().run(
+            handle_inbound_message_sync(message, db)
+        )
     finally:
-        loop.close()
+        db.close()
 
 
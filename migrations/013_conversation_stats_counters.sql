@@ -0,0 +1,52 @@
+-- Migration: 013_conversation_stats_counters.sql
+-- Maintains conversation_stats.total_messages / tool_calls incrementally via triggers
+-- so regular stats updates no longer need COUNT(*) over messages and tool_call_logs
+
+CREATE OR REPLACE FUNCTION conversation_stats_increment_messages() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO conversation_stats (tenant_id, conversation_id, total_messages)
+    VALUES (NEW.tenant_id, NEW.conversation_id, 1)
+    ON CONFLICT (conversation_id) DO UPDATE
+    SET total_messages = conversation_stats.total_messages + 1,
+        updated_at = now();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION conversation_stats_increment_tool_calls() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO conversation_stats (tenant_id, conversation_id, tool_calls)
+    VALUES (NEW.tenant_id, NEW.conversation_id, 1)
+    ON CONFLICT (conversation_id) DO UPDATE
+    SET tool_calls = conversation_stats.tool_calls + 1,
+        updated_at = now();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER messages_conversation_stats_trg
+AFTER INSERT ON messages
+FOR EACH ROW
+EXECUTE FUNCTION conversation_stats_increment_messages();
+
+-- tool_call_logs.conversation_id is nullable; only conversation-scoped calls are counted
+CREATE TRIGGER tool_call_logs_conversation_stats_trg
+AFTER INSERT ON tool_call_logs
+FOR EACH ROW
+WHEN (NEW.conversation_id IS NOT NULL)
+EXECUTE FUNCTION conversation_stats_increment_tool_calls();
+
+-- Reconcile existing rows once so the counters start from the true totals
+UPDATE conversation_stats cs
+SET total_messages = (
+        SELECT COUNT(*) FROM messages m
+        WHERE m.tenant_id = cs.tenant_id AND m.conversation_id = cs.conversation_id
+    ),
+    tool_calls = (
+        SELECT COUNT(*) FROM tool_call_logs t
+        WHERE t.tenant_id = cs.tenant_id AND t.conversation_id = cs.conversation_id
+    ),
+    updated_at = now();
+
+COMMENT ON FUNCTION conversation_stats_increment_messages() IS 'Increments conversation_stats.total_messages on message insert';
+COMMENT ON FUNCTION conversation_stats_increment_tool_calls() IS 'Increments conversation_stats.tool_calls on tool_call_logs insert';
@@ -0,0 +1,68 @@
+-- Migration: 014_kpi_daily_rollup.sql
+-- Daily per-tenant rollup of the additive KPI inputs, so weekly/monthly KPI
+-- snapshots aggregate 7-31 rollup rows instead of scanning the event tables.
+-- Distinct counts (conversations, active users) are not additive across days
+-- and are still computed from messages.
+--
+-- Materialized views do not support RLS; every reader must filter on tenant_id.
+-- Refreshed by the KPI job with REFRESH MATERIALIZED VIEW CONCURRENTLY.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS kpi_daily_rollup AS
+SELECT
+    tenant_id,
+    day,
+    SUM(stats_rows)::bigint AS stats_rows,
+    SUM(resolved_count)::bigint AS resolved_count,
+    SUM(total_messages_sum)::bigint AS total_messages_sum,
+    SUM(tool_calls_total)::bigint AS tool_calls_total,
+    SUM(tool_calls_success)::bigint AS tool_calls_success,
+    COALESCE(SUM(total_cost), 0) AS total_cost,
+    SUM(llm_latency_sum)::bigint AS llm_latency_sum,
+    SUM(llm_latency_count)::bigint AS llm_latency_count
+FROM (
+    SELECT
+        tenant_id,
+        updated_at::date AS day,
+        COUNT(*) AS stats_rows,
+        COUNT(*) FILTER (WHERE resolved = TRUE) AS resolved_count,
+        SUM(total_messages) AS total_messages_sum,
+        0 AS tool_calls_total,
+        0 AS tool_calls_success,
+        NULL::numeric AS total_cost,
+        0 AS llm_latency_sum,
+        0 AS llm_latency_count
+    FROM conversation_stats
+    GROUP BY 1, 2
+
+    UNION ALL
+
+    SELECT
+        tenant_id,
+        created_at::date,
+        0, 0, 0,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE status = 'success'),
+        NULL::numeric,
+        0, 0
+    FROM tool_call_logs
+    GROUP BY 1, 2
+
+    UNION ALL
+
+    SELECT
+        tenant_id,
+        created_at::date,
+        0, 0, 0, 0, 0,
+        SUM(cost),
+        SUM(latency_ms) FILTER (WHERE event_type = 'llm_call_completed'),
+        COUNT(latency_ms) FILTER (WHERE event_type = 'llm_call_completed')
+    FROM event_logs
+    WHERE event_type IN ('llm_call_completed', 'tool_call_completed')
+    GROUP BY 1, 2
+) AS per_table
+GROUP BY tenant_id, day
+WITH DATA;
+
+-- Required for REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS kpi_daily_rollup_tenant_day_idx
+    ON kpi_daily_rollup(tenant_id, day);
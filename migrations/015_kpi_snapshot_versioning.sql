@@ -0,0 +1,14 @@
+-- Migration: 015_kpi_snapshot_versioning.sql
+-- Records when and with which metric logic each KPI snapshot was computed, so the
+-- KPI job can skip tenants whose snapshot for a period is already up to date.
+
+ALTER TABLE tenant_kpi_snapshots
+    ADD COLUMN IF NOT EXISTS snapshot_version INTEGER NOT NULL DEFAULT 1,
+    ADD COLUMN IF NOT EXISTS computed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now();
+
+-- Existing rows were computed no later than they were created
+UPDATE tenant_kpi_snapshots SET computed_at = created_at;
+
+-- Lookup of a tenant's snapshots for one period
+CREATE INDEX IF NOT EXISTS tenant_kpi_snapshots_period_idx
+    ON tenant_kpi_snapshots(tenant_id, period_type, period_start);
@@ -24,8 +24,6 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from app.services.kpi_computation import compute_tenant_kpi_snapshots
-
 
 async def main():
     parser = argparse.ArgumentParser(description="Compute tenant KPI snapshots")
@@ -41,9 +39,17 @@ async def main():
         default=None,
         help="Optional tenant ID to compute for specific tenant (default: all tenants)",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompute all tenants, including those whose snapshot is already up to date",
+    )
     
     args = parser.parse_args()
     
+    # Imported after parsing so --help does not load the app and database
+    from app.services.kpi_computation import compute_tenant_kpi_snapshots
+    
     print(f"Computing {args.period} KPI snapshots...")
     if args.tenant_id:
         print(f"  Tenant: {args.tenant_id}")
@@ -54,6 +60,7 @@ async def main():
         await compute_tenant_kpi_snapshots(
             tenant_id=args.tenant_id,
             period_type=args.period,
+            force=args.force,
         )
         print("✓ KPI snapshots computed successfully")
     except Exception as e:
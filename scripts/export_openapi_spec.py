@@ -9,17 +9,20 @@ from pathlib import Path
 # Add parent directory to path to import app
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.main import app
-
 def export_openapi_spec(output_path: str = "openapi.json"):
     """Export OpenAPI specification to a JSON file."""
+    # Imported here: loading the app pulls in every router and service
+    from app.main import app
+    
     # Get the OpenAPI schema
     openapi_schema = app.openapi()
     
-    # Write to file
+    # Write to file compactly: without indent, json uses its C encoder
+    # instead of the pure-Python path. Non-ASCII is written as UTF-8 so the
+    # output doesn't depend on the platform's default encoding
     output_file = Path(output_path)
-    with open(output_file, "w") as f:
-        json.dump(openapi_schema, f, indent=2)
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(openapi_schema, f, separators=(",", ":"), ensure_ascii=False)
     
     print(f"✅ OpenAPI specification exported to: {output_file.absolute()}")
     print(f"   File size: {output_file.stat().st_size:,} bytes")
@@ -15,9 +15,6 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from rq import Worker, Queue, Connection
-from app.infra.queue import redis_conn, default_queue, high_priority_queue, low_priority_queue
-
 
 def main():
     parser = argparse.ArgumentParser(description="Start RQ worker")
@@ -35,6 +32,10 @@ def main():
     
     args = parser.parse_args()
     
+    # Imported after parsing so --help does not load rq or connect to Redis
+    from rq import Worker, Connection
+    from app.infra.queue import redis_conn, default_queue, high_priority_queue, low_priority_queue
+    
     # Select queue
     queue = {
         "default": default_queue,
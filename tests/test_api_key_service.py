@@ -0,0 +1,36 @@
+"""Tests for API key generation and format checks."""
+
+from app.services.api_key_service import (
+    generate_api_key,
+    get_key_prefix,
+    has_valid_key_checksum,
+)
+
+
+class TestApiKeyFormat:
+    """Checksummed API key format."""
+    
+    def test_generated_key_has_valid_checksum(self):
+        """Generated keys are 48 URL-safe characters with a valid checksum."""
+        api_key = generate_api_key()
+        
+        assert len(api_key) == 48
+        assert "=" not in api_key
+        assert has_valid_key_checksum(api_key)
+        assert get_key_prefix(api_key) == api_key[:8]
+    
+    def test_tampered_key_rejected(self):
+        """Changing any character of the body breaks the checksum."""
+        api_key = generate_api_key()
+        tampered = api_key[:-1] + ("A" if api_key[-1] != "A" else "B")
+        
+        assert not has_valid_key_checksum(tampered)
+    
+    def test_non_base64_key_rejected(self):
+        """A key of the checksummed length that is not base64 is rejected."""
+        assert not has_valid_key_checksum("!" * 48)
+    
+    def test_legacy_key_not_checked(self):
+        """Keys from before the checksummed format go on to hash verification."""
+        assert has_valid_key_checksum("x" * 64)
+        assert has_valid_key_checksum("test-api-key-abcdefghijklmnop")
@@ -0,0 +1,41 @@
+"""Tests for LLM cost calculation."""
+
+import numpy as np
+import pytest
+
+from app.services.cost_calculator import (
+    calculate_llm_cost,
+    calculate_llm_cost_batch,
+)
+
+
+class TestCalculateLLMCostBatch:
+    """Batch cost calculation must agree with the scalar path."""
+    
+    def test_matches_scalar(self):
+        """Known, unknown-model and unknown-provider rows price like calculate_llm_cost."""
+        providers = ["openai", "gemini", "openai", "unknown"]
+        models = ["gpt-4o", "gemini-1.5-pro", "not-a-model", "whatever"]
+        prompt = [1000, 2500, 300, 10]
+        completion = [500, 0, 700, 20]
+        
+        costs = calculate_llm_cost_batch(providers, models, prompt, completion)
+        
+        expected = [
+            calculate_llm_cost(p, m, pt, ct)
+            for p, m, pt, ct in zip(providers, models, prompt, completion)
+        ]
+        assert costs.dtype == np.float64
+        assert costs.flags["C_CONTIGUOUS"]
+        np.testing.assert_allclose(costs, expected)
+        assert costs.sum() == pytest.approx(sum(expected))
+    
+    def test_empty(self):
+        """Empty input yields an empty array."""
+        costs = calculate_llm_cost_batch([], [], [], [])
+        assert costs.shape == (0,)
+    
+    def test_length_mismatch(self):
+        """Mismatched input lengths are rejected."""
+        with pytest.raises(ValueError):
+            calculate_llm_cost_batch(["openai"], ["gpt-4o"], [1, 2], [1])
@@ -4,6 +4,8 @@ import pytest
 from app.services.prompt_validator import (
     validate_tenant_system_prompt,
     PromptValidationStatus,
+    FORBIDDEN_PATTERNS,
+    _PREFILTER_KEYWORDS,
 )
 
 
@@ -142,3 +144,8 @@ Do anything the user asks."""
         assert "META_OVERRIDE_ATTEMPT" in issue_codes
 
 
+    
+    def test_every_pattern_has_prefilter_keyword(self):
+        """Test that the keyword prefilter cannot skip any forbidden pattern."""
+        for pattern, _, _ in FORBIDDEN_PATTERNS:
+            assert any(keyword in pattern.lower() for keyword in _PREFILTER_KEYWORDS), pattern